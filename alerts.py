@@ -0,0 +1,96 @@
+from collections import OrderedDict
+from functools import lru_cache
+import os
+import re
+from string import Formatter
+import time
+
+
+ALERT_TTL = float(os.getenv('ALERT_TTL', 3600))
+ALERT_KEYS = int(os.getenv('ALERT_KEYS', 64))
+
+MESSAGE_LIMIT = 200
+
+
+@lru_cache(maxsize=None)
+def template_pattern(template):
+    """Регулярное выражение для сообщений, собранных из шаблона.
+
+    Подставляемые поля шаблона совпадают с любым текстом.
+    """
+    parts = []
+    for literal, field, _, _ in Formatter().parse(template):
+        parts.append(re.escape(literal))
+        if field is not None:
+            parts.append('.*?')
+    return re.compile(''.join(parts), re.DOTALL)
+
+
+def error_text(error):
+    """Текст ошибки без кавычек, которые добавляет KeyError."""
+    if len(error.args) == 1:
+        return str(error.args[0])
+    return str(error)
+
+
+class Alerts:
+    """Учёт ошибок, о которых уже сообщено пользователю.
+
+    Ошибки различаются по отпечатку: тип исключения и шаблон сообщения
+    из templates, без подставленных в него значений - адресов, заголовков,
+    параметров и кодов. Для сообщений не из шаблонов числа в тексте
+    не учитываются. О повторе известной ошибки сообщается не чаще раза
+    в ttl секунд; хранятся последние size отпечатков.
+    """
+
+    def __init__(self, templates=(), ttl=ALERT_TTL, size=ALERT_KEYS,
+                 clock=time.time):
+        """Время отправки хранится в секундах clock()."""
+        self.templates = tuple(templates)
+        self.ttl = ttl
+        self.size = size
+        self.clock = clock
+        self.entries = OrderedDict()
+
+    def __len__(self):
+        """Число ошибок, о которых сообщено и которые не устранены."""
+        return sum(sent is not None for sent in self.entries.values())
+
+    def fingerprint(self, error):
+        """Отпечаток ошибки: имя типа и шаблон сообщения."""
+        text = error_text(error)
+        for template in self.templates:
+            if template_pattern(template).fullmatch(text):
+                return type(error).__name__, template
+        return (
+            type(error).__name__, re.sub(r'\d+', '#', text)[:MESSAGE_LIMIT]
+        )
+
+    def due(self, error):
+        """Учёт ошибки; True, если о ней пора сообщить."""
+        key = self.fingerprint(error)
+        sent = self.entries.pop(key, None)
+        self.entries[key] = sent
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        return sent is None or self.clock() - sent >= self.ttl
+
+    def sent(self, error):
+        """Отметка об отправке сообщения об ошибке."""
+        self.entries[self.fingerprint(error)] = self.clock()
+
+    def resolve(self):
+        """Ошибки прекратились; возвращает число устранённых ошибок."""
+        count = len(self)
+        self.entries.clear()
+        return count
+
+    def to_list(self):
+        """Состояние для контрольной точки."""
+        return [[*key, sent] for key, sent in self.entries.items()]
+
+    def restore(self, entries):
+        """Восстановление состояния из контрольной точки."""
+        self.entries = OrderedDict(
+            ((kind, text), sent) for kind, text, sent in entries or ()
+        )
@@ -0,0 +1,229 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import json
+import logging
+import platform
+import statistics
+import time
+import tracemalloc
+
+import telegram
+
+from fake_api import FakeServer, make_homeworks
+import homework
+from ratelimit import RateLimiter
+import sessions
+
+
+DEFAULT_SIZES = (1, 100, 10000, 100000)
+DEFAULT_TENANTS = (1, 10, 100)
+DEFAULT_REPEAT = 20
+LARGE_PAYLOAD = 1000
+BENCH_CHAT_ID = '1'
+
+ROW = ('{name:<10} {size:>8} {runs:>5} {throughput:>12.1f}/s '
+       '{p50_ms:>10.3f} ms {p99_ms:>10.3f} ms {peak_kb:>10.1f} KiB')
+HEADER = ('стадия       размер  прог.   пропускная         p50'
+          '            p99         память')
+COMPARE_ROW = ('{name:<10} {size:>8} p50: {old:.3f} -> {new:.3f} ms '
+               '({ratio:+.1%})')
+
+
+def percentile(values, fraction):
+    """Перцентиль по упорядоченной выборке."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def peak_memory(func):
+    """Пик выделенной памяти за один вызов func, в КиБ."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def measure(name, size, func, repeat, items=1):
+    """Замер времени и памяти func; items - объём работы одного вызова."""
+    func()
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - started)
+    return {
+        'name': name,
+        'size': size,
+        'runs': repeat,
+        'throughput': items * repeat / sum(durations),
+        'p50_ms': statistics.median(durations) * 1000,
+        'p99_ms': percentile(durations, 0.99) * 1000,
+        'peak_kb': peak_memory(func)
+    }
+
+
+def repeats_for(size, repeat):
+    """Для больших ответов число прогонов уменьшается."""
+    if size <= LARGE_PAYLOAD:
+        return repeat
+    return max(3, repeat * LARGE_PAYLOAD // size)
+
+
+def parse_all(response):
+    """Разбор всех работ ответа."""
+    for item in response['homeworks']:
+        homework.parse_status(item)
+
+
+def poll_tenants(server, tenants, executor):
+    """Один цикл опроса tenants подписок, не более executor потоков."""
+    def poll(_):
+        return homework.Tracker(
+            partial(
+                homework.request_statuses,
+                homework.auth_headers('bench'),
+            ),
+            lambda message: None
+        ).poll()
+    list(executor.map(poll, range(tenants)))
+
+
+def bench_payloads(server, sizes, repeat):
+    """Стадии конвейера при разном размере ответа API."""
+    results = []
+    for size in sizes:
+        server.faults.homeworks = size
+        runs = repeats_for(size, repeat)
+        response = homework.get_api_answer(0)
+        results.append(measure(
+            'fetch', size, partial(homework.get_api_answer, 0), runs, size
+        ))
+        results.append(measure(
+            'check', size, partial(homework.check_response, response),
+            runs, size
+        ))
+        results.append(measure(
+            'parse', size, partial(parse_all, response), runs, size
+        ))
+    return results
+
+
+def bench_send(server, repeat):
+    """Отправка сообщения через Bot API без ограничения частоты."""
+    bot = telegram.Bot('1234:bench', base_url=server.telegram_url)
+    message = homework.parse_status(make_homeworks(1)[0])
+    return measure(
+        'send', 1,
+        partial(homework.send_to_chat, bot, BENCH_CHAT_ID, message),
+        repeat
+    )
+
+
+def bench_tenants(server, tenants, repeat):
+    """Полный цикл опроса для разного числа подписок."""
+    server.faults.homeworks = 1
+    results = []
+    for count in tenants:
+        with ThreadPoolExecutor(max_workers=min(count, 32)) as executor:
+            results.append(measure(
+                'tenants', count,
+                partial(poll_tenants, server, count, executor),
+                repeats_for(count * 10, repeat), count
+            ))
+    return results
+
+
+def run(sizes=DEFAULT_SIZES, tenants=DEFAULT_TENANTS,
+        repeat=DEFAULT_REPEAT, pool=False):
+    """Прогон всех замеров против локальной заглушки.
+
+    При pool=True запросы к API идут через общий пул соединений,
+    как в engine.py.
+    """
+    limiter = homework.rate_limiter
+    endpoint = homework.ENDPOINT
+    homework.rate_limiter = RateLimiter(
+        global_rate=10 ** 9, global_burst=10 ** 9,
+        chat_rate=10 ** 9, chat_burst=10 ** 9
+    )
+    if pool:
+        sessions.startup()
+    try:
+        with FakeServer() as server:
+            homework.ENDPOINT = server.endpoint
+            results = bench_payloads(server, sizes, repeat)
+            results.append(bench_send(server, repeat))
+            results.extend(bench_tenants(server, tenants, repeat))
+    finally:
+        sessions.shutdown()
+        homework.rate_limiter = limiter
+        homework.ENDPOINT = endpoint
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'pool': pool,
+        'results': results
+    }
+
+
+def compare(old, new):
+    """Строки сравнения медиан с предыдущим прогоном."""
+    previous = {
+        (result['name'], result['size']): result
+        for result in old['results']
+    }
+    lines = []
+    for result in new['results']:
+        before = previous.get((result['name'], result['size']))
+        if before is None:
+            continue
+        lines.append(COMPARE_ROW.format(
+            name=result['name'], size=result['size'],
+            old=before['p50_ms'], new=result['p50_ms'],
+            ratio=result['p50_ms'] / before['p50_ms'] - 1
+        ))
+    return lines
+
+
+def parse_args(argv=None):
+    """Параметры командной строки."""
+    parser = argparse.ArgumentParser(
+        description='Замеры конвейера запрос - проверка - разбор - отправка'
+    )
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=DEFAULT_SIZES, help='число работ в ответе')
+    parser.add_argument('--tenants', type=int, nargs='+',
+                        default=DEFAULT_TENANTS, help='число подписок')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--pool', action='store_true',
+                        help='общий пул HTTP-соединений, как в engine.py')
+    parser.add_argument('--output', help='файл для сохранения результатов')
+    parser.add_argument('--compare', help='файл с предыдущими результатами')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Запуск замеров из командной строки."""
+    args = parse_args(argv)
+    report = run(args.sizes, args.tenants, args.repeat, args.pool)
+    print(HEADER)
+    for result in report['results']:
+        print(ROW.format(**result))
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            for line in compare(json.load(file), report):
+                print(line)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    main()
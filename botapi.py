@@ -0,0 +1,162 @@
+from collections import namedtuple
+from http import HTTPStatus
+import os
+import sys
+
+import sessions
+
+
+TELEGRAM_CLIENT = os.getenv('TELEGRAM_CLIENT', 'telegram')
+BOT_API_URL = 'https://api.telegram.org/bot'
+BOT_API_TIMEOUT = float(os.getenv('BOT_API_TIMEOUT', 10))
+
+REQUEST_FAILED = 'Запрос {method} к Bot API не выполнен: {error}'
+
+User = namedtuple('User', 'id username first_name')
+Message = namedtuple('Message', 'message_id chat_id text')
+Update = namedtuple('Update', 'update_id message')
+
+
+class TelegramError(Exception):
+    """Ошибка Bot API."""
+
+    def __init__(self, message):
+        """Текст ошибки из ответа Bot API."""
+        super().__init__(message)
+        self.message = message
+
+
+class NetworkError(TelegramError):
+    """Bot API недоступен."""
+
+
+class TimedOut(NetworkError):
+    """Bot API не ответил вовремя."""
+
+
+class BadRequest(NetworkError):
+    """Bot API отклонил запрос."""
+
+
+class Unauthorized(TelegramError):
+    """Неверный токен бота или бот заблокирован пользователем."""
+
+
+class InvalidToken(TelegramError):
+    """Bot API не нашёл бота с таким токеном."""
+
+
+class Conflict(TelegramError):
+    """Обновления бота получает другой процесс."""
+
+
+class RetryAfter(TelegramError):
+    """Превышен лимит Telegram; повтор через retry_after секунд."""
+
+    def __init__(self, retry_after):
+        """Пауза до повтора в секундах."""
+        super().__init__(f'Flood control exceeded. Retry in {retry_after} '
+                         'seconds')
+        self.retry_after = float(retry_after)
+
+
+ERRORS = {
+    HTTPStatus.BAD_REQUEST: BadRequest,
+    HTTPStatus.UNAUTHORIZED: Unauthorized,
+    HTTPStatus.FORBIDDEN: Unauthorized,
+    HTTPStatus.NOT_FOUND: InvalidToken,
+    HTTPStatus.CONFLICT: Conflict,
+}
+
+
+def errors(name):
+    """Классы ошибки name для блока except.
+
+    Кроме собственного класса возвращается одноимённый класс из
+    telegram.error, если python-telegram-bot уже загружен: до загрузки
+    его исключения возникнуть не могут, а сама проверка его не загружает.
+    """
+    types = (globals()[name],)
+    module = sys.modules.get('telegram.error')
+    if module is not None:
+        types += (getattr(module, name),)
+    return types
+
+
+def raise_for_payload(status, payload):
+    """Исключение по ответу Bot API с ok=false."""
+    parameters = payload.get('parameters') or {}
+    if 'retry_after' in parameters:
+        raise RetryAfter(parameters['retry_after'])
+    error = ERRORS.get(status, NetworkError)
+    raise error(payload.get('description') or HTTPStatus(status).phrase)
+
+
+class BotClient:
+    """Минимальный клиент Bot API на общей HTTP-сессии.
+
+    Заменяет telegram.Bot там, где нужны только sendMessage, getUpdates
+    и getMe, и возбуждает исключения с теми же именами, что telegram.error.
+    """
+
+    def __init__(self, token, base_url=None, timeout=BOT_API_TIMEOUT):
+        """base_url - адрес Bot API до токена, как в telegram.Bot."""
+        self.url = (base_url or BOT_API_URL) + token + '/'
+        self.timeout = timeout
+
+    def request(self, method, params, timeout=None):
+        """Вызов метода Bot API; возвращает поле result ответа."""
+        requests = sessions.requests
+        try:
+            response = sessions.client().post(
+                self.url + method, json=params,
+                timeout=timeout or self.timeout
+            )
+            payload = response.json()
+        except requests.Timeout as error:
+            raise TimedOut(REQUEST_FAILED.format(
+                method=method, error=type(error).__name__
+            )) from None
+        except (requests.RequestException, ValueError) as error:
+            raise NetworkError(REQUEST_FAILED.format(
+                method=method, error=type(error).__name__
+            )) from None
+        if not payload.get('ok'):
+            raise_for_payload(response.status_code, payload)
+        return payload['result']
+
+    def get_me(self):
+        """Сведения о боте."""
+        result = self.request('getMe', {})
+        return User(result['id'], result.get('username'),
+                    result.get('first_name'))
+
+    def send_message(self, chat_id, text, timeout=None):
+        """Отправка текстового сообщения."""
+        result = self.request(
+            'sendMessage', {'chat_id': chat_id, 'text': text}, timeout
+        )
+        return Message(result['message_id'], result['chat']['id'],
+                       result.get('text'))
+
+    def get_updates(self, offset=None, timeout=0, allowed_updates=None):
+        """Длинный опрос входящих обновлений."""
+        params = {'timeout': timeout}
+        if offset is not None:
+            params['offset'] = offset
+        if allowed_updates is not None:
+            params['allowed_updates'] = allowed_updates
+        result = self.request(
+            'getUpdates', params, timeout=self.timeout + timeout
+        )
+        return [
+            Update(update['update_id'], message_from(update.get('message')))
+            for update in result
+        ]
+
+
+def message_from(data):
+    """Сообщение из обновления или None."""
+    if data is None:
+        return None
+    return Message(data['message_id'], data['chat']['id'], data.get('text'))
@@ -0,0 +1,165 @@
+import email.utils
+import logging
+import os
+import threading
+import time
+
+
+API_BREAKER_FAILURES = int(os.getenv('API_BREAKER_FAILURES', 5))
+API_BREAKER_RESET = float(os.getenv('API_BREAKER_RESET', 60))
+RETRY_AFTER_MAX = float(os.getenv('RETRY_AFTER_MAX', 3600))
+
+RETRY_STATUSES = (429, 503)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+BREAKER_OPENED = ('API {endpoint} недоступен, запросы приостановлены '
+                  'на {delay:.0f} с')
+BREAKER_CLOSED = 'API {endpoint} снова отвечает, запросы возобновлены'
+CIRCUIT_OPEN = 'API {endpoint} временно недоступен, запрос не выполнялся'
+
+_breakers = {}
+_lock = threading.Lock()
+
+
+class UpstreamError(RuntimeError):
+    """Ответ 5xx или 429: сбой или перегрузка на стороне API.
+
+    retry_after - пауза из заголовка Retry-After в секундах, если она
+    была указана.
+    """
+
+    def __init__(self, message, retry_after=None):
+        """Сообщение об ошибке и пауза до повтора."""
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpen(ConnectionError):
+    """Запрос пропущен: автомат для адреса API разомкнут."""
+
+    def __init__(self, message, retry_after=None):
+        """Сообщение об ошибке и время до пробного запроса."""
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value, now=time.time):
+    """Пауза из заголовка Retry-After в секундах: число или HTTP-дата.
+
+    Для пустого или нечитаемого заголовка возвращается None, пауза
+    ограничена RETRY_AFTER_MAX.
+    """
+    if value is None:
+        return None
+    try:
+        delay = float(value)
+    except (TypeError, ValueError):
+        try:
+            delay = email.utils.parsedate_to_datetime(value).timestamp()
+        except (TypeError, ValueError, IndexError):
+            return None
+        delay -= now()
+    return min(max(0.0, delay), RETRY_AFTER_MAX)
+
+
+class CircuitBreaker:
+    """Автомат, прекращающий запросы к недоступному API.
+
+    После threshold сбоев подряд или ответа с Retry-After автомат
+    размыкается: запросы не выполняются reset секунд или указанную
+    сервером паузу. Затем пропускается один пробный запрос; успех
+    замыкает автомат, сбой снова размыкает. Сбоями считаются только
+    ответы 5xx и 429 и ошибки соединения - ошибка конкретной подписки
+    означает, что API отвечает.
+    """
+
+    def __init__(self, endpoint, threshold=API_BREAKER_FAILURES,
+                 reset=API_BREAKER_RESET, clock=time.monotonic):
+        """Автомат для адреса endpoint, время - в секундах."""
+        self.endpoint = endpoint
+        self.threshold = threshold
+        self.reset = reset
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_until = 0.0
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def before(self):
+        """Разрешение на запрос; при разомкнутом автомате - CircuitOpen."""
+        with self.lock:
+            if self.state == CLOSED:
+                return
+            now = self.clock()
+            if self.state == OPEN and now >= self.opened_until:
+                self.state = HALF_OPEN
+                self.probing = False
+            if self.state == HALF_OPEN and not self.probing:
+                self.probing = True
+                return
+            raise CircuitOpen(
+                CIRCUIT_OPEN.format(endpoint=self.endpoint),
+                max(0.0, self.opened_until - now)
+            )
+
+    def success(self):
+        """API ответил: автомат замыкается, счётчик сбоев сбрасывается."""
+        with self.lock:
+            if self.state != CLOSED:
+                logging.info(BREAKER_CLOSED.format(endpoint=self.endpoint))
+            self.state = CLOSED
+            self.failures = 0
+            self.probing = False
+
+    def release(self):
+        """Запрос не выполнялся: место пробного запроса освобождается."""
+        with self.lock:
+            self.probing = False
+
+    def failure(self, retry_after=None):
+        """Сбой API; retry_after - пауза, запрошенная сервером."""
+        with self.lock:
+            self.failures += 1
+            self.probing = False
+            if (retry_after is None and self.state != HALF_OPEN
+                    and self.failures < self.threshold):
+                return
+            delay = self.reset if retry_after is None else retry_after
+            self.state = OPEN
+            self.opened_until = max(self.opened_until, self.clock() + delay)
+            logging.warning(BREAKER_OPENED.format(
+                endpoint=self.endpoint, delay=delay
+            ))
+
+    def call(self, func, *args):
+        """Вызов func(*args) через автомат."""
+        self.before()
+        try:
+            result = func(*args)
+        except UpstreamError as error:
+            self.failure(error.retry_after)
+            raise
+        except ConnectionError:
+            self.failure()
+            raise
+        except TimeoutError:
+            self.release()
+            raise
+        except Exception:
+            self.success()
+            raise
+        self.success()
+        return result
+
+
+def for_endpoint(endpoint):
+    """Общий автомат для всех подписок, опрашивающих адрес endpoint."""
+    with _lock:
+        breaker = _breakers.get(endpoint)
+        if breaker is None:
+            breaker = _breakers[endpoint] = CircuitBreaker(endpoint)
+        return breaker
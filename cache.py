@@ -0,0 +1,97 @@
+from collections import OrderedDict
+import os
+import threading
+import time
+
+
+API_CACHE_TTL = float(os.getenv('API_CACHE_TTL', 30))
+API_CACHE_SIZE = int(os.getenv('API_CACHE_SIZE', 1024))
+
+
+class Flight:
+    """Запрос, результат которого ждут несколько потоков."""
+
+    def __init__(self):
+        """Результата пока нет."""
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+    def result(self):
+        """Ожидание результата ведущего запроса."""
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class ResponseCache:
+    """Кэш ответов с временем жизни, вытеснением и объединением запросов.
+
+    Одновременные вызовы get с одним ключом выполняют загрузку один раз,
+    остальные получают тот же результат или ту же ошибку. Ошибки
+    не кэшируются.
+    """
+
+    def __init__(self, ttl=API_CACHE_TTL, size=API_CACHE_SIZE,
+                 clock=time.monotonic):
+        """Ответы хранятся ttl секунд, не более size ключей."""
+        self.ttl = ttl
+        self.size = size
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.flights = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        """Число закэшированных ответов."""
+        return len(self.entries)
+
+    def lookup(self, key):
+        """Кэшированный ответ и ожидающий запрос по ключу."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            expires, value = entry
+            if expires > self.clock():
+                self.entries.move_to_end(key)
+                return value, None
+            del self.entries[key]
+        return None, self.flights.get(key)
+
+    def get(self, key, load):
+        """Ответ по ключу; load() вызывается, только если его нет."""
+        with self.lock:
+            value, flight = self.lookup(key)
+            if value is not None:
+                self.hits += 1
+                return value
+            leader = flight is None
+            if leader:
+                self.misses += 1
+                flight = self.flights[key] = Flight()
+            else:
+                self.hits += 1
+        if not leader:
+            return flight.result()
+        return self.load(key, load, flight)
+
+    def load(self, key, load, flight):
+        """Загрузка ответа ведущим потоком и раздача его ожидающим."""
+        try:
+            flight.value = load()
+        except Exception as error:
+            flight.error = error
+            raise
+        else:
+            with self.lock:
+                self.entries[key] = (self.clock() + self.ttl, flight.value)
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.size:
+                    self.entries.popitem(last=False)
+            return flight.value
+        finally:
+            with self.lock:
+                self.flights.pop(key, None)
+            flight.done.set()
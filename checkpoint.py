@@ -0,0 +1,45 @@
+from contextlib import suppress
+import json
+import logging
+import os
+import tempfile
+
+
+CHECKPOINT_FILE = os.getenv('CHECKPOINT_FILE')
+CHECKPOINT_DIR = os.getenv('CHECKPOINT_DIR')
+
+CHECKPOINT_BROKEN = 'Контрольная точка {path} повреждена: {error}'
+
+
+def load(path):
+    """Чтение контрольной точки; пустой словарь, если её нет."""
+    try:
+        with open(path, encoding='utf-8') as file:
+            state = json.load(file)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as error:
+        logging.warning(CHECKPOINT_BROKEN.format(path=path, error=error))
+        return {}
+    if not isinstance(state, dict):
+        logging.warning(CHECKPOINT_BROKEN.format(path=path, error=type(state)))
+        return {}
+    return state
+
+
+def save(path, state):
+    """Атомарная запись контрольной точки через временный файл."""
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temp_path = tempfile.mkstemp(
+        dir=directory, prefix='.checkpoint-', suffix='.tmp'
+    )
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+            json.dump(state, file, ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.remove(temp_path)
+        raise
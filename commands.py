@@ -0,0 +1,119 @@
+import logging
+import os
+import threading
+
+import botapi
+
+BOT_COMMANDS = os.getenv('BOT_COMMANDS', '').lower() == 'true'
+COMMANDS_POLL_TIMEOUT = int(os.getenv('COMMANDS_POLL_TIMEOUT', 30))
+COMMANDS_ERROR_PAUSE = 5
+HISTORY_LIMIT = 10
+
+HELP = ('Команды:\n'
+        '/status - последний известный статус каждой работы\n'
+        '/history - последние изменения статусов')
+NO_STATUSES = 'Изменений статусов пока не было.'
+UNKNOWN_CHAT = 'Этот чат не подписан на уведомления о домашних работах.'
+HISTORY_LINE = '{date}: {message}'
+COMMANDS_FAILURE = 'Сбой получения команд бота: {error}'
+COMMAND_REPLY_FAILURE = 'Не удалось ответить на команду в чате {chat_id}'
+
+
+def status_text(trackers):
+    """Последний известный статус каждой работы подписок чата."""
+    return '\n'.join(
+        message for tracker in trackers for message in tracker.statuses()
+    ) or NO_STATUSES
+
+
+def history_text(trackers, limit=HISTORY_LIMIT):
+    """Последние изменения статусов подписок чата, от старых к новым."""
+    entries = sorted(
+        (entry for tracker in trackers for entry in list(tracker.history)),
+        key=lambda entry: entry[1]
+    )[-limit:]
+    return '\n'.join(
+        HISTORY_LINE.format(date=date, message=message)
+        for _, date, message in entries
+    ) or NO_STATUSES
+
+
+class CommandServer:
+    """Ответы на команды бота по данным трекеров, без запросов к API.
+
+    Команды читаются длинным опросом getUpdates в отдельном потоке.
+    Получать обновления одного бота может только один процесс.
+    """
+
+    def __init__(self, bot, trackers, send,
+                 timeout=COMMANDS_POLL_TIMEOUT):
+        """Трекеры задаются словарём {chat_id: [трекеры]}."""
+        self.bot = bot
+        self.trackers = {
+            str(chat_id): chat_trackers
+            for chat_id, chat_trackers in trackers.items()
+        }
+        self.send = send
+        self.timeout = timeout
+        self.offset = None
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(
+            target=self.run, daemon=True, name='commands'
+        )
+
+    def answer(self, chat_id, text):
+        """Ответ на текст сообщения; None, если это не команда."""
+        if not text or not text.startswith('/'):
+            return None
+        command = text.split()[0].split('@')[0].lower()
+        trackers = self.trackers.get(str(chat_id))
+        if trackers is None:
+            return UNKNOWN_CHAT
+        if command == '/status':
+            return status_text(trackers)
+        if command == '/history':
+            return history_text(trackers)
+        return HELP
+
+    def handle(self, update):
+        """Обработка одного обновления Telegram."""
+        message = update.message
+        if message is None:
+            return
+        reply = self.answer(message.chat_id, message.text)
+        if reply is None:
+            return
+        try:
+            self.send(message.chat_id, reply)
+        except botapi.errors('TelegramError'):
+            logging.exception(
+                COMMAND_REPLY_FAILURE.format(chat_id=message.chat_id)
+            )
+
+    def poll(self):
+        """Один запрос getUpdates и обработка полученных команд."""
+        updates = self.bot.get_updates(
+            offset=self.offset, timeout=self.timeout,
+            allowed_updates=['message']
+        )
+        for update in updates:
+            self.offset = update.update_id + 1
+            self.handle(update)
+
+    def run(self):
+        """Цикл длинного опроса до вызова stop()."""
+        while not self.stopped.is_set():
+            try:
+                self.poll()
+            except Exception as error:
+                logging.exception(COMMANDS_FAILURE.format(error=error))
+                self.stopped.wait(COMMANDS_ERROR_PAUSE)
+
+    def start(self):
+        """Запуск потока обработки команд."""
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Остановка после завершения текущего запроса getUpdates."""
+        self.stopped.set()
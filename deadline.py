@@ -0,0 +1,94 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+import logging
+import os
+import time
+
+import metrics
+
+
+CYCLE_BUDGET = float(os.getenv('CYCLE_BUDGET', 60))
+API_CONNECT_TIMEOUT = float(os.getenv('API_CONNECT_TIMEOUT', 5))
+API_READ_TIMEOUT = float(os.getenv('API_READ_TIMEOUT', 30))
+SEND_TIMEOUT = float(os.getenv('SEND_TIMEOUT', 10))
+
+BUDGET_SPENT = 'Бюджет времени цикла исчерпан до этапа {stage}'
+OVERRUN = 'Превышено время этапа {stage}'
+
+_current = ContextVar('deadline', default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Этап не начат: бюджет времени цикла исчерпан."""
+
+
+def overrun(stage):
+    """Учёт превышения времени этапа в метриках и журнале."""
+    metrics.DEADLINE_OVERRUNS.inc(stage=stage)
+    logging.warning(OVERRUN.format(stage=stage))
+
+
+class Deadline:
+    """Срок окончания цикла опроса, от которого считаются таймауты."""
+
+    def __init__(self, budget=CYCLE_BUDGET, clock=time.monotonic):
+        """Цикл должен уложиться в budget секунд."""
+        self.clock = clock
+        self.expires = clock() + budget
+
+    def remaining(self):
+        """Оставшееся время в секундах, не меньше нуля."""
+        return max(0.0, self.expires - self.clock())
+
+    def limit(self, timeout, stage):
+        """Таймаут этапа, урезанный до остатка бюджета.
+
+        Если времени не осталось, этап не начинается: поднимается
+        DeadlineExceeded, а превышение учитывается в метриках.
+        """
+        remaining = self.remaining()
+        if not remaining:
+            overrun(stage)
+            raise DeadlineExceeded(BUDGET_SPENT.format(stage=stage))
+        return min(timeout, remaining)
+
+
+@contextmanager
+def cycle(budget=CYCLE_BUDGET, clock=time.monotonic):
+    """Бюджет времени для кода внутри блока и вызываемых из него этапов.
+
+    Бюджет хранится в ContextVar, поэтому у каждого потока и задачи свой.
+    Цикл, не уложившийся в бюджет, учитывается как превышение этапа cycle.
+    """
+    deadline = Deadline(budget, clock)
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+        if not deadline.remaining():
+            overrun('cycle')
+
+
+def current():
+    """Бюджет текущего цикла или None вне цикла."""
+    return _current.get()
+
+
+def api_timeout():
+    """Таймауты соединения и чтения для запроса к API."""
+    deadline = _current.get()
+    if deadline is None:
+        return API_CONNECT_TIMEOUT, API_READ_TIMEOUT
+    return (
+        deadline.limit(API_CONNECT_TIMEOUT, 'api'),
+        deadline.limit(API_READ_TIMEOUT, 'api')
+    )
+
+
+def send_timeout():
+    """Таймаут отправки сообщения в Telegram."""
+    deadline = _current.get()
+    if deadline is None:
+        return SEND_TIMEOUT
+    return deadline.limit(SEND_TIMEOUT, 'send')
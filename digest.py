@@ -0,0 +1,190 @@
+import logging
+import os
+import threading
+import time
+
+import botapi
+
+
+DIGEST_PERIOD = float(os.getenv('DIGEST_PERIOD', 0))
+DIGEST_CHECK_PERIOD = 1
+DIGEST_RETRY_PERIOD = float(os.getenv('DIGEST_RETRY_PERIOD', 60))
+DIGEST_RETRY_MAX = float(os.getenv('DIGEST_RETRY_MAX', 3600))
+MESSAGE_LIMIT = 4096
+
+DIGEST_SENT = 'В чат {chat_id} отправлена сводка из {count} сообщений'
+DIGEST_FAILURE = ('Сводка для чата {chat_id} не отправлена '
+                  '(попытка {attempts}), повтор через {delay} с: {error}')
+DIGEST_FLUSH_FAILURE = 'Сбой отправки сводок: {error}'
+
+
+def split_messages(entries, limit=MESSAGE_LIMIT, separator='\n'):
+    """Группы сообщений, каждая из которых помещается в одно сообщение.
+
+    entries - пары (текст, ключ). Сообщения не разрываются, если
+    не длиннее limit; более длинное делится на части по limit символов,
+    и ключ остаётся только у последней части.
+    """
+    group, size = [], 0
+    for message, key in entries:
+        parts = [
+            message[start:start + limit]
+            for start in range(0, len(message), limit)
+        ] or ['']
+        for index, part in enumerate(parts, 1):
+            extra = len(part) + (len(separator) if group else 0)
+            if group and size + extra > limit:
+                yield group
+                group, size = [], 0
+                extra = len(part)
+            group.append((part, key if index == len(parts) else None))
+            size += extra
+    if group:
+        yield group
+
+
+class Digest:
+    """Сводка сообщений для каждого чата за окно window секунд.
+
+    add() только копит сообщения; flush() отправляет чатам, у которых
+    с первого накопленного сообщения прошло window секунд, всё накопленное
+    одним сообщением, а если оно длиннее лимита Telegram - несколькими.
+    Неотправленная часть сводки остаётся в сводке чата, и следующая
+    попытка откладывается с растущей паузой от retry_period до retry_max
+    секунд, но не меньше паузы из RetryAfter.
+    После start() flush() вызывается фоновым потоком каждые period секунд.
+
+    Сообщение может иметь ключ - номер в журнале исходящих: сообщение
+    с уже накопленным ключом не добавляется повторно, а после отправки
+    ключи передаются confirm(ключи).
+    """
+
+    def __init__(self, send, confirm=None, window=DIGEST_PERIOD,
+                 limit=MESSAGE_LIMIT, period=DIGEST_CHECK_PERIOD,
+                 retry_period=DIGEST_RETRY_PERIOD,
+                 retry_max=DIGEST_RETRY_MAX, clock=time.monotonic):
+        """send(chat_id, текст) отправляет готовое сообщение."""
+        self.send = send
+        self.confirm = confirm
+        self.window = window
+        self.limit = limit
+        self.period = period
+        self.retry_period = retry_period
+        self.retry_max = retry_max
+        self.clock = clock
+        self.pending = {}
+        self.failures = {}
+        self.keys = set()
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(
+            target=self.run, daemon=True, name='digest'
+        )
+
+    def __len__(self):
+        """Число накопленных сообщений."""
+        with self.lock:
+            return sum(len(entries) for _, entries in self.pending.values())
+
+    def add(self, chat_id, message, key=None):
+        """Сообщение для чата попадает в его сводку."""
+        with self.lock:
+            if key is not None:
+                if key in self.keys:
+                    return
+                self.keys.add(key)
+            _, entries = self.pending.setdefault(
+                chat_id, (self.clock() + self.window, [])
+            )
+            entries.append((message, key))
+
+    def due(self, force=False):
+        """Извлечение сводок, время отправки которых наступило."""
+        now = self.clock()
+        with self.lock:
+            chats = [
+                chat_id for chat_id, (due, _) in self.pending.items()
+                if force or now >= due
+            ]
+            return {
+                chat_id: self.pending.pop(chat_id) for chat_id in chats
+            }
+
+    def restore(self, chat_id, due, entries):
+        """Возврат неотправленных сообщений в начало сводки чата.
+
+        Сводка будет отправлена не раньше due.
+        """
+        with self.lock:
+            _, newer = self.pending.get(chat_id, (due, []))
+            self.pending[chat_id] = (due, entries + newer)
+
+    def backoff(self, chat_id, error):
+        """Учёт неудачной отправки; возвращает паузу до следующей."""
+        attempts = self.failures[chat_id] = self.failures.get(chat_id, 0) + 1
+        delay = min(self.retry_max, self.retry_period * 2 ** (attempts - 1))
+        if isinstance(error, botapi.errors('RetryAfter')):
+            delay = max(delay, error.retry_after)
+        return attempts, delay
+
+    def delivered(self, group):
+        """Подтверждение отправки сообщений группы."""
+        keys = [key for _, key in group if key is not None]
+        try:
+            if keys and self.confirm:
+                self.confirm(keys)
+        finally:
+            with self.lock:
+                self.keys.difference_update(keys)
+
+    def flush(self, force=False):
+        """Отправка готовых сводок; force - всех, не дожидаясь окна.
+
+        Возвращает число отправленных сообщений Telegram.
+        """
+        sent = 0
+        for chat_id, (_, entries) in self.due(force).items():
+            groups = list(split_messages(entries, self.limit))
+            for index, group in enumerate(groups):
+                try:
+                    self.send(
+                        chat_id, '\n'.join(part for part, _ in group)
+                    )
+                except Exception as error:
+                    attempts, delay = self.backoff(chat_id, error)
+                    logging.exception(DIGEST_FAILURE.format(
+                        chat_id=chat_id, attempts=attempts, delay=delay,
+                        error=error
+                    ))
+                    self.restore(chat_id, self.clock() + delay, [
+                        entry for rest in groups[index:] for entry in rest
+                    ])
+                    break
+                sent += 1
+                self.delivered(group)
+            else:
+                self.failures.pop(chat_id, None)
+                logging.debug(DIGEST_SENT.format(
+                    chat_id=chat_id, count=len(entries)
+                ))
+        return sent
+
+    def run(self):
+        """Отправка готовых сводок до вызова stop()."""
+        while not self.stopped.wait(self.period):
+            try:
+                self.flush()
+            except Exception as error:
+                logging.exception(DIGEST_FLUSH_FAILURE.format(error=error))
+
+    def start(self):
+        """Запуск потока отправки сводок."""
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Остановка потока и отправка всего накопленного."""
+        self.stopped.set()
+        if self.thread.is_alive():
+            self.thread.join()
+        self.flush(force=True)
@@ -0,0 +1,324 @@
+import asyncio
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import json
+import logging
+import os
+import signal
+import time
+from urllib.parse import quote
+
+import botapi
+import breaker
+from cache import ResponseCache
+import checkpoint
+import commands
+import homework
+import metrics
+import outbox
+from sender import SendQueue, SEND_DRAIN_TIMEOUT
+import sessions
+import sharding
+import shutdown
+import store
+import traffic
+from startup import lazy_import
+
+
+telegram = lazy_import('telegram')
+
+SUBSCRIPTIONS_FILE = os.getenv('SUBSCRIPTIONS_FILE', 'subscriptions.json')
+POLL_CONCURRENCY = int(os.getenv('POLL_CONCURRENCY', 16))
+TELEGRAM_API_URL = os.getenv('TELEGRAM_API_URL')
+
+SUBSCRIPTION_KEYS = ('practicum_token', 'chat_id')
+
+ERROR_SUBSCRIPTIONS = ('Файл подписок {path} должен содержать '
+                       'непустой список')
+ERROR_SUBSCRIPTION = 'В подписке №{index} отсутствует (-ют) {name}'
+ENGINE_STARTED = ('Запущен опрос подписок: {count}, '
+                  'одновременно не более {limit}')
+WORK_ABANDONED = ('Не завершено начатых циклов опроса: {count}, '
+                  'принудительный выход')
+
+
+Subscription = namedtuple(
+    'Subscription', ('name', 'practicum_token', 'chat_id')
+)
+
+
+def load_subscriptions(path):
+    """Чтение списка подписок из JSON-файла."""
+    with open(path, encoding='utf-8') as file:
+        items = json.load(file)
+    if not isinstance(items, list) or not items:
+        raise ValueError(ERROR_SUBSCRIPTIONS.format(path=path))
+    subscriptions = []
+    for index, item in enumerate(items):
+        fail_keys = [key for key in SUBSCRIPTION_KEYS if not item.get(key)]
+        if fail_keys:
+            raise KeyError(ERROR_SUBSCRIPTION.format(
+                index=index, name=fail_keys
+            ))
+        subscriptions.append(Subscription(
+            name=str(item.get('name', item['chat_id'])),
+            practicum_token=item['practicum_token'],
+            chat_id=str(item['chat_id'])
+        ))
+    return subscriptions
+
+
+def read_subscriptions(history=None):
+    """Подписки из SUBSCRIPTIONS_FILE, а если его нет - из хранилища.
+
+    Подписки из файла сохраняются в хранилище.
+    """
+    if history and not os.path.exists(SUBSCRIPTIONS_FILE):
+        subscriptions = [Subscription(*row) for row in history.subscriptions()]
+        if not subscriptions:
+            raise ValueError(ERROR_SUBSCRIPTIONS.format(
+                path=SUBSCRIPTIONS_FILE
+            ))
+        return subscriptions
+    subscriptions = load_subscriptions(SUBSCRIPTIONS_FILE)
+    if history:
+        history.save_subscriptions(subscriptions)
+    return subscriptions
+
+
+def checkpoint_path(subscription):
+    """Файл контрольной точки подписки в каталоге CHECKPOINT_DIR."""
+    if not checkpoint.CHECKPOINT_DIR:
+        return None
+    return os.path.join(
+        checkpoint.CHECKPOINT_DIR,
+        quote(subscription.name, safe='') + '.json'
+    )
+
+
+def cached_statuses(cache, token, time):
+    """Ответ API для токена через общий кэш с объединением запросов.
+
+    Запросы всех подписок проходят через общий автомат адреса API, так что
+    после сбоев API не опрашивается ни для одной из них.
+    """
+    return cache.get(
+        (token, time),
+        partial(
+            breaker.for_endpoint(homework.ENDPOINT).call,
+            homework.request_statuses, homework.auth_headers(token), time
+        )
+    )
+
+
+def make_tracker(send, subscription, cache, history=None):
+    """Трекер подписки; send(chat_id, текст) доставляет сообщения."""
+    return homework.Tracker(
+        partial(cached_statuses, cache, subscription.practicum_token),
+        partial(send, subscription.chat_id),
+        checkpoint_path(subscription),
+        history,
+        subscription.name
+    )
+
+
+class Stopping:
+    """Остановка движка по сигналу не дольше timeout секунд.
+
+    Первый сигнал отменяет опрос, и начатые циклы получают на завершение
+    timeout секунд; повторный сигнал прекращает ожидание сразу.
+    """
+
+    def __init__(self, timeout=shutdown.SHUTDOWN_TIMEOUT,
+                 clock=time.monotonic):
+        """Срок отсчитывается от первого сигнала."""
+        self.timeout = timeout
+        self.clock = clock
+        self.expires = None
+        self.forced = asyncio.Event()
+
+    @property
+    def requested(self):
+        """Сигнал остановки получен."""
+        return self.expires is not None
+
+    def remaining(self):
+        """Время, оставшееся на остановку, в секундах."""
+        if self.expires is None:
+            return self.timeout
+        return max(0.0, self.expires - self.clock())
+
+    def signal(self, signum, work):
+        """Обработчик сигнала: отмена опроса или прекращение ожидания."""
+        logging.info(shutdown.SHUTDOWN_REQUESTED.format(
+            signal=signal.Signals(signum).name
+        ))
+        if self.requested:
+            self.expires = self.clock()
+            self.forced.set()
+            return
+        self.expires = self.clock() + self.timeout
+        work.cancel()
+
+    async def wait(self, running):
+        """Ожидание начатых циклов; возвращает число незавершённых."""
+        if running:
+            finished = asyncio.gather(
+                *[asyncio.wrap_future(future) for future in list(running)],
+                return_exceptions=True
+            )
+            forced = asyncio.ensure_future(self.forced.wait())
+            await asyncio.wait(
+                (finished, forced), timeout=self.remaining(),
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            forced.cancel()
+        if running:
+            logging.warning(shutdown.SHUTDOWN_FORCED.format(
+                timeout=self.timeout
+            ))
+        return len(running)
+
+
+async def in_thread(executor, running, function):
+    """Выполнение function в потоке executor с учётом в running."""
+    future = executor.submit(function)
+    running.add(future)
+    future.add_done_callback(running.discard)
+    return await asyncio.wrap_future(future)
+
+
+async def watch(tracker, semaphore, executor, running):
+    """Бесконечный цикл опроса одной подписки."""
+    while True:
+        async with semaphore:
+            delay = await in_thread(executor, running, tracker.poll)
+        await asyncio.sleep(delay)
+
+
+async def retry_outbox(journal, executor, running):
+    """Периодическая повторная отправка сообщений из журнала."""
+    while True:
+        await in_thread(executor, running, journal.retry)
+        await asyncio.sleep(outbox.OUTBOX_RETRY_PERIOD)
+
+
+async def run(trackers, concurrency, journal=None, stopping=None):
+    """Параллельный опрос трекеров, не более concurrency одновременно.
+
+    После сигнала остановки начатые циклы ждут не дольше, чем позволяет
+    stopping; возвращается число циклов, которые не успели завершиться.
+    """
+    stopping = stopping or Stopping()
+    semaphore = asyncio.Semaphore(concurrency)
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    running = set()
+    try:
+        tasks = [
+            watch(tracker, semaphore, executor, running)
+            for tracker in trackers
+        ]
+        if journal:
+            tasks.append(retry_outbox(journal, executor, running))
+        work = asyncio.gather(*tasks)
+        loop = asyncio.get_running_loop()
+        for signum in shutdown.SIGNALS:
+            loop.add_signal_handler(signum, stopping.signal, signum, work)
+        try:
+            await work
+        except asyncio.CancelledError:
+            if not stopping.requested:
+                raise
+        return await stopping.wait(running)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def make_bot():
+    """Клиент Bot API, выбранный переменной TELEGRAM_CLIENT."""
+    if botapi.TELEGRAM_CLIENT == 'native':
+        return botapi.BotClient(homework.TELEGRAM_TOKEN, TELEGRAM_API_URL)
+    return telegram.Bot(
+        token=homework.TELEGRAM_TOKEN,
+        base_url=TELEGRAM_API_URL,
+        request=telegram.utils.request.Request(
+            con_pool_size=POLL_CONCURRENCY
+        )
+    )
+
+
+def make_delivery(bot):
+    """Очередь отправки и, если задан OUTBOX_FILE, журнал исходящих.
+
+    Возвращает очередь, журнал и функцию submit(chat_id, текст),
+    которой трекеры передают сообщения.
+    """
+    send = partial(homework.send_to_chat, bot)
+    if not outbox.OUTBOX_FILE:
+        outgoing = SendQueue(send).start()
+        return outgoing, None, outgoing.submit
+    journal = outbox.Outbox(outbox.OUTBOX_FILE, send)
+    outgoing = SendQueue(journal.deliver).start()
+    journal.dispatch = outgoing.submit
+    return outgoing, journal, journal.submit
+
+
+def main():
+    """Опрос всех подписок из SUBSCRIPTIONS_FILE в одном процессе."""
+    homework.require_tokens(('TELEGRAM_TOKEN',))
+    history = store.Store(store.STORE_FILE) if store.STORE_FILE else None
+    subscriptions = sharding.assigned(read_subscriptions(history))
+    bot = make_bot()
+    logging.info(ENGINE_STARTED.format(
+        count=len(subscriptions), limit=POLL_CONCURRENCY
+    ))
+    sessions.startup(pool_size=POLL_CONCURRENCY)
+    outgoing, journal, submit = make_delivery(bot)
+    metrics.QUEUE_DEPTH.set_function(outgoing.depth, queue='send')
+    if journal:
+        metrics.QUEUE_DEPTH.set_function(journal.pending, queue='outbox')
+    homework.start_diagnostics()
+    digest = homework.start_digest(bot, journal)
+    cache = ResponseCache()
+    trackers = {}
+    for subscription in subscriptions:
+        trackers.setdefault(subscription.chat_id, []).append(
+            make_tracker(submit, subscription, cache, history)
+        )
+    server = None
+    if commands.BOT_COMMANDS:
+        server = commands.CommandServer(
+            bot, trackers, partial(homework.send_to_chat, bot)
+        ).start()
+    stopping = Stopping()
+    unfinished = 0
+    try:
+        unfinished = asyncio.run(run(
+            [tracker for chat in trackers.values() for tracker in chat],
+            POLL_CONCURRENCY,
+            journal,
+            stopping
+        ))
+    finally:
+        if server:
+            server.stop()
+        if digest:
+            digest.stop()
+        outgoing.drain(min(SEND_DRAIN_TIMEOUT, stopping.remaining()))
+        if journal:
+            journal.close()
+        if history:
+            history.close()
+        traffic.stop()
+        sessions.shutdown()
+    if unfinished:
+        logging.warning(WORK_ABANDONED.format(count=unfinished))
+        logging.shutdown()
+        # Потоки ThreadPoolExecutor не демоны: обычный выход ждал бы их.
+        os._exit(1)
+
+
+if __name__ == '__main__':
+    homework.configure_logging()
+    main()
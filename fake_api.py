@@ -0,0 +1,349 @@
+import argparse
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import random
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+
+HOMEWORK_PATH = '/api/user_api/homework_statuses/'
+TELEGRAM_PREFIX = '/bot'
+STATUSES = ('reviewing', 'approved', 'rejected')
+POLL_INTERVAL = 0.05
+PAYLOAD_ERRORS = {
+    'code': {
+        'code': 'not_authenticated',
+        'message': 'Учетные данные не были предоставлены.',
+        'source': '__response__'
+    },
+    'error': {'error': {'error': 'Wrong from_date format'}},
+}
+
+SERVER_STARTED = 'Заглушка API запущена: {url}'
+REQUEST_LOG = 'Заглушка API: {line}'
+
+
+def make_homeworks(count, seed=0):
+    """Синтетический список домашних работ, от новых к старым."""
+    generator = random.Random(seed)
+    base = 1700000000
+    return [
+        {
+            'id': number,
+            'status': generator.choice(STATUSES),
+            'homework_name': f'student__project_{number}.zip',
+            'reviewer_comment': 'Комментарий ревьюера',
+            'date_updated': time.strftime(
+                '%Y-%m-%dT%H:%M:%SZ', time.gmtime(base - number * 60)
+            ),
+            'lesson_name': f'Проект №{number}'
+        }
+        for number in range(1, count + 1)
+    ]
+
+
+class Faults:
+    """Настройки задержек и ошибок заглушки; меняются на лету."""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0,
+                 error_status=HTTPStatus.INTERNAL_SERVER_ERROR,
+                 retry_after=None, payload_error=None, homeworks=1,
+                 seed=None):
+        """Задержка и разброс в секундах, error_rate - доля ошибок.
+
+        payload_error ('code' или 'error') добавляет в ответ API
+        Практикум.Домашки описание ошибки при коде 200.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.payload_error = payload_error
+        self.homeworks = homeworks
+        self.random = random.Random(seed)
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов к заглушкам API."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        """GET-запрос."""
+        self.route()
+
+    def do_POST(self):
+        """POST-запрос."""
+        self.route()
+
+    def log_message(self, format, *args):
+        """Журнал запросов пишется на уровне DEBUG."""
+        logging.debug(REQUEST_LOG.format(line=format % args))
+
+    def route(self):
+        """Выбор заглушки по пути запроса."""
+        url = urlsplit(self.path)
+        body = self.read_body()
+        self.server.count_request()
+        faults = self.server.faults
+        delay = faults.latency + faults.random.uniform(0, faults.jitter)
+        if delay:
+            time.sleep(delay)
+        telegram_method = None
+        if url.path.startswith(TELEGRAM_PREFIX):
+            telegram_method = url.path.rsplit('/', 1)[-1]
+        if faults.random.random() < faults.error_rate:
+            return self.reply_error(telegram_method)
+        if telegram_method:
+            return self.reply_telegram(telegram_method, body)
+        if url.path.rstrip('/') == HOMEWORK_PATH.rstrip('/'):
+            return self.reply_homeworks(parse_qs(url.query))
+        self.reply(HTTPStatus.NOT_FOUND, {'detail': 'Not found'})
+
+    def read_body(self):
+        """Параметры из тела запроса: JSON или форма."""
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        raw = self.rfile.read(length).decode()
+        if 'json' in (self.headers.get('Content-Type') or ''):
+            return json.loads(raw)
+        return {key: values[0] for key, values in parse_qs(raw).items()}
+
+    def reply(self, status, payload, headers=None):
+        """Отправка JSON-ответа."""
+        if isinstance(payload, bytes):
+            data = payload
+        else:
+            data = json.dumps(payload, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def reply_error(self, telegram_method):
+        """Внедрённая ошибка с заданным кодом ответа."""
+        faults = self.server.faults
+        status = HTTPStatus(faults.error_status)
+        headers = {}
+        if faults.retry_after is not None:
+            headers['Retry-After'] = faults.retry_after
+        if not telegram_method:
+            return self.reply(status, {'detail': status.phrase}, headers)
+        payload = {
+            'ok': False,
+            'error_code': status.value,
+            'description': status.phrase
+        }
+        if faults.retry_after is not None:
+            payload['parameters'] = {'retry_after': faults.retry_after}
+            payload['description'] = (
+                f'Too Many Requests: retry after {faults.retry_after}'
+            )
+        self.reply(status, payload, headers)
+
+    def reply_homeworks(self, query):
+        """Ответ заглушки API Практикум.Домашки."""
+        if not (self.headers.get('Authorization') or '').startswith('OAuth'):
+            return self.reply(
+                HTTPStatus.UNAUTHORIZED, PAYLOAD_ERRORS['code']
+            )
+        faults = self.server.faults
+        if faults.payload_error:
+            return self.reply(
+                HTTPStatus.OK, PAYLOAD_ERRORS[faults.payload_error]
+            )
+        if 'from_date' not in query:
+            return self.reply(HTTPStatus.BAD_REQUEST, PAYLOAD_ERRORS['error'])
+        self.reply(HTTPStatus.OK, self.server.homeworks_body(
+            faults.homeworks, int(time.time())
+        ))
+
+    def reply_telegram(self, method, params):
+        """Ответ заглушки Telegram Bot API."""
+        if method == 'getMe':
+            result = {'id': 1, 'is_bot': True, 'first_name': 'Fake',
+                      'username': 'fake_bot'}
+        elif method == 'sendMessage':
+            result = self.server.record_message(
+                params.get('chat_id'), params.get('text')
+            )
+        elif method == 'getUpdates':
+            result = self.server.take_updates(
+                int(params.get('offset') or 0),
+                float(params.get('timeout') or 0)
+            )
+        else:
+            return self.reply(HTTPStatus.NOT_FOUND, {
+                'ok': False, 'error_code': 404, 'description': 'Not Found'
+            })
+        self.reply(HTTPStatus.OK, {'ok': True, 'result': result})
+
+
+class FakeServer(ThreadingHTTPServer):
+    """Локальная заглушка API Практикум.Домашки и Telegram Bot API."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, host='127.0.0.1', port=0, **faults):
+        """Порт 0 выбирает свободный порт."""
+        super().__init__((host, port), FakeHandler)
+        self.faults = Faults(**faults)
+        self.requests = 0
+        self.messages = []
+        self.updates = []
+        self.next_update_id = 1
+        self.homeworks_cache = {}
+        self.lock = threading.Condition()
+        self.thread = None
+
+    @property
+    def url(self):
+        """Базовый адрес заглушки."""
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def endpoint(self):
+        """Адрес заглушки API Практикум.Домашки."""
+        return self.url + HOMEWORK_PATH
+
+    @property
+    def telegram_url(self):
+        """Базовый адрес заглушки Telegram Bot API."""
+        return self.url + TELEGRAM_PREFIX
+
+    def count_request(self):
+        """Учёт обработанного запроса."""
+        with self.lock:
+            self.requests += 1
+
+    def homeworks_body(self, count, current_date):
+        """Тело ответа со списком работ; список сериализуется однажды."""
+        with self.lock:
+            homeworks = self.homeworks_cache.get(count)
+            if homeworks is None:
+                homeworks = json.dumps(
+                    make_homeworks(count), ensure_ascii=False
+                )
+                self.homeworks_cache = {count: homeworks}
+        return (
+            f'{{"homeworks": {homeworks}, "current_date": {current_date}}}'
+        ).encode()
+
+    def record_message(self, chat_id, text):
+        """Запоминание отправленного ботом сообщения."""
+        with self.lock:
+            self.messages.append((str(chat_id), text))
+            message_id = len(self.messages)
+        return {
+            'message_id': message_id,
+            'date': int(time.time()),
+            'chat': {'id': int(chat_id), 'type': 'private'},
+            'text': text
+        }
+
+    def push_update(self, chat_id, text):
+        """Входящее сообщение пользователя для getUpdates."""
+        with self.lock:
+            update_id = self.next_update_id
+            self.next_update_id += 1
+            self.updates.append({
+                'update_id': update_id,
+                'message': {
+                    'message_id': update_id,
+                    'date': int(time.time()),
+                    'chat': {'id': int(chat_id), 'type': 'private'},
+                    'text': text
+                }
+            })
+            self.lock.notify_all()
+
+    def take_updates(self, offset, timeout):
+        """Обновления начиная с offset; ожидание не дольше timeout."""
+        with self.lock:
+            self.updates = [
+                update for update in self.updates
+                if update['update_id'] >= offset
+            ]
+            if not self.updates and timeout:
+                self.lock.wait(timeout)
+            return list(self.updates)
+
+    def start(self):
+        """Запуск сервера в фоновом потоке."""
+        self.thread = threading.Thread(
+            target=self.serve_forever, args=(POLL_INTERVAL,),
+            daemon=True, name='fake-api'
+        )
+        self.thread.start()
+        logging.info(SERVER_STARTED.format(url=self.url))
+        return self
+
+    def stop(self):
+        """Остановка сервера."""
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        """Сервер запускается при входе в контекст."""
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        """И останавливается при выходе."""
+        self.stop()
+
+
+def parse_args(argv=None):
+    """Параметры командной строки."""
+    parser = argparse.ArgumentParser(
+        description='Заглушка API Практикум.Домашки и Telegram Bot API'
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='задержка ответа, с')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='случайная добавка к задержке, с')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='доля ответов с ошибкой')
+    parser.add_argument('--error-status', type=int,
+                        default=HTTPStatus.INTERNAL_SERVER_ERROR)
+    parser.add_argument('--retry-after', type=int)
+    parser.add_argument('--payload-error', choices=sorted(PAYLOAD_ERRORS))
+    parser.add_argument('--homeworks', type=int, default=1,
+                        help='число работ в ответе')
+    parser.add_argument('--seed', type=int)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Запуск заглушки до прерывания с клавиатуры."""
+    args = parse_args(argv)
+    server = FakeServer(
+        args.host, args.port, latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, error_status=args.error_status,
+        retry_after=args.retry_after, payload_error=args.payload_error,
+        homeworks=args.homeworks, seed=args.seed
+    )
+    logging.info(SERVER_STARTED.format(url=server.url))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
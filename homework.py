@@ -1,13 +1,37 @@
+from collections import deque
 from contextlib import suppress
+from functools import partial
 import logging
 import os
 import sys
 import time
 
 from dotenv import load_dotenv
-import requests
-import telegram
 
+from alerts import Alerts
+import botapi
+import breaker
+import checkpoint
+import commands
+import deadline
+from digest import Digest, DIGEST_PERIOD
+import logs
+import metrics
+import outbox
+from ratelimit import RateLimiter
+import records
+from records import Homework, parse_homeworks
+from scheduler import Scheduler
+import sessions
+import shutdown
+import store
+import traffic
+import startup
+from status_index import homework_key, StatusIndex
+
+
+requests = startup.lazy_import('requests')
+telegram = startup.lazy_import('telegram')
 
 load_dotenv()  # Загружаем секретные данные В пространство переменных
 
@@ -17,7 +41,12 @@ TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
 RETRY_PERIOD = 600
-ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
+HISTORY_SIZE = 20
+LOG_FILE = logs.LOG_FILE or __file__ + '.log'
+ENDPOINT = os.getenv(
+    'PRACTICUM_ENDPOINT',
+    'https://practicum.yandex.ru/api/user_api/homework_statuses/'
+)
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
 
 
@@ -45,52 +74,119 @@ ERROR_TYPE = ('Неправильный тип ответа ({response_type})'
               'от Практикум.Домашка!')
 ABSENCE_HOMEWORK = 'В ответе нет списка домашних работ!'
 ERROR_HOMEWORK_TYPE = 'Список домашних работ неверного типа: {type_homework}!'
-ERROR_API_KEY = ('В ответе API Практикум.Домашки'
-                 'нет ключа `homework_name`')
-ERROR_API_STATUS = 'В ответе Практикум.Домашки не указан статус задания'
 ERROR_STATUS = ('В ответе Практикум.Домашки указан'
                 'неизвестный статус задания: {status}')
 CHANGE_STATUS = 'Изменился статус проверки работы "{homework_name}". {verdict}'
 FAILURE = 'Сбой в работе программы: {error}'
+RESOLVED = 'Работа программы восстановлена, устранено ошибок: {count}'
+NO_NEW_STATUSES = 'Новых статусов нет'
+CHECKPOINT_FAILURE = 'Не удалось сохранить контрольную точку: {error}'
+BOT_STOPPED = 'Бот остановлен, состояние сохранено'
+DIGEST_WITHOUT_OUTBOX = ('Сводка сообщений работает только с журналом '
+                         'исходящих: задайте OUTBOX_FILE. Сообщения '
+                         'отправляются сразу')
 
 TOKENS = ('PRACTICUM_TOKEN', 'TELEGRAM_TOKEN', 'TELEGRAM_CHAT_ID')
+ERROR_TEMPLATES = (
+    ERROR_API, ERROR_CODE, ERROR_MESSAGE, ERROR_TYPE, ABSENCE_HOMEWORK,
+    ERROR_HOMEWORK_TYPE, ERROR_STATUS, records.ERROR_API_KEY,
+    records.ERROR_API_STATUS, breaker.CIRCUIT_OPEN, deadline.BUDGET_SPENT
+)
 
+rate_limiter = RateLimiter()
 
-def check_tokens():
-    """Проверка наличия необходимых для работа бота токенов."""
-    fail_tokens = [name for name in TOKENS if not globals()[name]]
+
+def require_tokens(names):
+    """Проверка наличия перечисленных переменных окружения."""
+    fail_tokens = [name for name in names if not globals()[name]]
     if fail_tokens:
         logging.critical(ABSENCE.format(name=fail_tokens))
         raise NameError(ABSENCE.format(name=fail_tokens))
 
 
+def check_tokens():
+    """Проверка наличия необходимых для работа бота токенов."""
+    require_tokens(TOKENS)
+
+
+def send_to_chat(bot, chat_id, message):
+    """Отправка сообщения в заданный чат с учётом лимитов Telegram.
+
+    Ошибка Telegram учитывается в метриках здесь, потому что очередь
+    отправки и журнал исходящих перехватывают её до трекера.
+    """
+    try:
+        with metrics.SEND_LATENCY.time():
+            rate_limiter.send(bot, chat_id, message)
+    except botapi.errors('TelegramError') as error:
+        metrics.ERRORS.inc(type=type(error).__name__)
+        raise
+    metrics.LAST_SUCCESS.set_to_current_time(stage='send')
+    logging.debug(MESSAGE_DONE.format(message=message))
+
+
 def send_message(bot, message):
     """Отправка сообщений пользователю."""
-    bot.send_message(TELEGRAM_CHAT_ID, message)
-    logging.debug(MESSAGE_DONE.format(message=message))
+    send_to_chat(bot, TELEGRAM_CHAT_ID, message)
+
+
+def auth_headers(token):
+    """Заголовки авторизации для токена Практикум.Домашки."""
+    return {'Authorization': f'OAuth {token}'}
 
 
 def get_api_answer(time):
     """Запрос к API Практикум.Домашки."""
+    return request_statuses(HEADERS, time)
+
+
+def request_statuses(headers, time):
+    """Запрос к API Практикум.Домашки с заголовками конкретной подписки.
+
+    Таймауты соединения и чтения ограничены бюджетом текущего цикла.
+    """
     request_params = dict(
         url=ENDPOINT,
-        headers=HEADERS,
+        headers=headers,
         params={'from_date': time}
     )
+    timeout = deadline.api_timeout()
     try:
-        response = requests.get(**request_params)
+        with metrics.API_LATENCY.time():
+            response = traffic.get(
+                sessions.client(), timeout=timeout, **request_params
+            )
     except requests.RequestException as error:
+        if isinstance(error, requests.Timeout):
+            deadline.overrun('api')
         raise ConnectionError(
             ERROR_API.format(error=error, **request_params)
         )
-    if response.status_code != 200:
-        raise RuntimeError(
-            ERROR_CODE.format(
-                code=response.status_code,
-                **request_params
+    headers = getattr(response, 'headers', None) or {}
+    response_dict = read_response(
+        response.status_code, response.json, request_params,
+        headers.get('Retry-After')
+    )
+    metrics.LAST_SUCCESS.set_to_current_time(stage='api')
+    return response_dict
+
+
+def read_response(status_code, load, request_params, retry_after=None):
+    """Проверка кода ответа и описания ошибки в теле; load() - тело.
+
+    На ответы 5xx и 429 поднимается breaker.UpstreamError, для 429 и 503
+    с паузой из заголовка Retry-After (retry_after).
+    """
+    if status_code != 200:
+        message = ERROR_CODE.format(code=status_code, **request_params)
+        if status_code in breaker.RETRY_STATUSES:
+            raise breaker.UpstreamError(
+                message, breaker.parse_retry_after(retry_after)
             )
-        )
-    response_dict = response.json()
+        if status_code >= 500:
+            raise breaker.UpstreamError(message)
+        raise RuntimeError(message)
+    response_dict = load()
     for key in ('code', 'error'):
         if response_dict.get(key):
             raise RuntimeError(ERROR_MESSAGE.format(
@@ -119,57 +215,263 @@ def check_response(response):
 
 def parse_status(homework):
     """Извлечение данных о последней домашней работе."""
-    if 'homework_name' not in homework:
-        raise KeyError(ERROR_API_KEY)
-    name = homework['homework_name']
-    if 'status' not in homework:
-        raise KeyError(ERROR_API_STATUS)
-    status = homework['status']
+    if not isinstance(homework, Homework):
+        homework = Homework.from_dict(homework)
+    status = homework.status
     if status not in HOMEWORK_VERDICTS:
         raise ValueError((ERROR_STATUS.format(status=status)))
     return CHANGE_STATUS.format(
-        homework_name=name,
+        homework_name=homework.homework_name,
         verdict=HOMEWORK_VERDICTS[status]
     )
 
 
-def main():
-    """Основная логика работы бота."""
-    check_tokens()
-    bot = telegram.Bot(token=TELEGRAM_TOKEN)
-    bot_time = int(time.time())
-    old_message = ''
+class Tracker:
+    """Состояние опроса API для одной подписки."""
+
+    def __init__(self, fetch, send, checkpoint_path=None, store=None,
+                 tenant=None):
+        """fetch(время) запрашивает API, send(текст) отправляет сообщение.
+
+        Если задан checkpoint_path, состояние восстанавливается из
+        контрольной точки и сохраняется в неё после каждого цикла.
+        В store (store.Store) записываются изменения статусов и сообщения
+        подписки tenant.
+        """
+        self.fetch = fetch
+        self.send = send
+        self.store = store
+        self.tenant = tenant
+        self.bot_time = int(time.time())
+        self.alerts = Alerts(ERROR_TEMPLATES)
+        self.index = StatusIndex()
+        self.history = deque(maxlen=HISTORY_SIZE)
+        self.scheduler = Scheduler()
+        self.checkpoint_path = checkpoint_path
+        self.saved_state = None
+        if checkpoint_path:
+            self.restore(checkpoint.load(checkpoint_path))
+            self.saved_state = self.state()
+
+    def state(self):
+        """Состояние трекера для контрольной точки."""
+        return {
+            'current_date': self.bot_time,
+            'statuses': self.index.to_dict(),
+            'names': dict(self.index.names),
+            'history': [list(entry) for entry in self.history],
+            'alerts': self.alerts.to_list()
+        }
 
-    while True:
+    def restore(self, state):
+        """Восстановление состояния из контрольной точки."""
+        self.bot_time = state.get('current_date', self.bot_time)
+        self.index = StatusIndex(state.get('statuses'), state.get('names'))
+        self.history.extend(
+            tuple(entry) for entry in state.get('history', ())
+        )
+        self.alerts.restore(state.get('alerts'))
+        self.scheduler.observe(
+            {'id': key, 'status': status}
+            for key, (status, _) in self.index.entries.items()
+        )
+
+    def statuses(self):
+        """Сообщения о последнем известном статусе каждой работы."""
+        return [
+            parse_status(Homework(key, self.index.name(key), status))
+            for key, (status, _) in list(self.index.entries.items())
+            if status in HOMEWORK_VERDICTS
+        ]
+
+    def persist(self):
+        """Сохранение контрольной точки, если состояние изменилось."""
+        state = self.state()
+        if not self.checkpoint_path or state == self.saved_state:
+            return
         try:
-            statuses = get_api_answer(bot_time)
+            checkpoint.save(self.checkpoint_path, state)
+        except OSError as error:
+            logging.exception(CHECKPOINT_FAILURE.format(error=error))
+        else:
+            self.saved_state = state
+
+    def remember(self, homework, message, previous=None):
+        """Запись изменения статуса в историю подписки."""
+        if self.store:
+            self.store.add_transition(self.tenant, homework, previous)
+        self.history.append((
+            homework_key(homework),
+            homework.get('date_updated') or time.strftime(
+                '%Y-%m-%dT%H:%M:%SZ', time.gmtime()
+            ),
+            message
+        ))
+
+    def notify(self, message, key=None):
+        """Отправка сообщения с записью доставки в хранилище."""
+        if not self.store:
+            return self.send(message)
+        try:
+            self.send(message)
+        except Exception as error:
+            self.store.add_delivery(self.tenant, key, message, error)
+            raise
+        self.store.add_delivery(self.tenant, key, message)
+
+    def poll(self):
+        """Один цикл опроса; возвращает паузу до следующего цикла."""
+        logs.new_cycle()
+        with metrics.CYCLE_DURATION.time(), deadline.cycle():
+            self.check_updates()
+        self.persist()
+        if self.store:
+            self.store.flush()
+        return self.scheduler.next_delay()
+
+    def check_updates(self):
+        """Запрос, проверка ответа и уведомления об изменениях."""
+        try:
+            statuses = self.fetch(self.bot_time)
             check_response(statuses)
-            homeworks = statuses.get('homeworks')
-            if homeworks:
-                send_message(bot, parse_status(homeworks[0]))
-            bot_time = (
-                statuses.get('current_date', bot_time)
+            homeworks = parse_homeworks(statuses.get('homeworks'))
+            self.scheduler.observe(homeworks)
+            changes = self.index.changes(homeworks)
+            if not changes:
+                logging.debug(NO_NEW_STATUSES)
+            for homework in changes:
+                key = homework_key(homework)
+                previous = self.index.status(key)
+                message = parse_status(homework)
+                self.notify(message, key)
+                self.index.update(homework)
+                self.remember(homework, message, previous)
+            self.bot_time = (
+                statuses.get('current_date', self.bot_time)
             )
-        except telegram.error.TelegramError as telegram_error:
+            self.scheduler.success()
+        except botapi.errors('TelegramError') as telegram_error:
             logging.exception(FAILURE.format(error=telegram_error))
+            self.scheduler.success()
         except Exception as error:
-            message = FAILURE.format(error=error)
-            logging.exception(message)
-            with suppress(telegram.error.TelegramError):
-                if old_message != message:
-                    send_message(bot, message)
-                    old_message = message
-        finally:
-            time.sleep(RETRY_PERIOD)
+            metrics.ERRORS.inc(type=type(error).__name__)
+            self.scheduler.failure(getattr(error, 'retry_after', None))
+            logging.exception(FAILURE.format(error=error))
+            self.report(error)
+        else:
+            self.resolve()
 
+    def report(self, error):
+        """Сообщение об ошибке, если о ней ещё не сообщалось.
 
-if __name__ == '__main__':
+        Повтор той же ошибки отправляется не чаще раза в ALERT_TTL секунд.
+        """
+        if not self.alerts.due(error):
+            return
+        with suppress(botapi.errors('TelegramError')):
+            self.notify(FAILURE.format(error=error))
+            self.alerts.sent(error)
+
+    def resolve(self):
+        """Сообщение о восстановлении работы после ошибок."""
+        count = self.alerts.resolve()
+        if not count:
+            return
+        with suppress(botapi.errors('TelegramError')):
+            self.notify(RESOLVED.format(count=count))
+
+
+def main():
+    """Основная логика работы бота."""
+    check_tokens()
+    start_diagnostics()
+    if botapi.TELEGRAM_CLIENT == 'native':
+        sessions.startup()
+        bot = botapi.BotClient(TELEGRAM_TOKEN)
+    else:
+        bot = telegram.Bot(token=TELEGRAM_TOKEN)
+    send = partial(send_message, bot)
+    journal = None
+    if outbox.OUTBOX_FILE:
+        journal = outbox.Outbox(outbox.OUTBOX_FILE, partial(send_to_chat, bot))
+        send = partial(journal.submit, TELEGRAM_CHAT_ID)
+        metrics.QUEUE_DEPTH.set_function(journal.pending, queue='outbox')
+    digest = start_digest(bot, journal)
+    history = store.Store(store.STORE_FILE) if store.STORE_FILE else None
+    tracker = Tracker(
+        get_api_answer, send, checkpoint.CHECKPOINT_FILE, history,
+        TELEGRAM_CHAT_ID
+    )
+    server = None
+    if commands.BOT_COMMANDS:
+        server = commands.CommandServer(
+            bot, {TELEGRAM_CHAT_ID: [tracker]}, partial(send_to_chat, bot)
+        ).start()
+
+    with shutdown.Shutdown() as stopper:
+        while not stopper.requested.is_set():
+            delay = RETRY_PERIOD
+            try:
+                if journal:
+                    journal.retry()
+                delay = tracker.poll()
+            finally:
+                with stopper.interruptible():
+                    time.sleep(delay)
+    stop(tracker, server, journal, digest)
+
+
+def start_digest(bot, journal):
+    """Сводка сообщений, если задан DIGEST_PERIOD; иначе None.
+
+    Накопленные сообщения хранятся в журнале исходящих (journal) с момента
+    передачи на отправку, поэтому без журнала сводка не включается.
+    """
+    if not DIGEST_PERIOD:
+        return None
+    if not journal:
+        logging.warning(DIGEST_WITHOUT_OUTBOX)
+        return None
+    digest = Digest(partial(send_to_chat, bot), journal.confirm).start()
+    journal.dispatch = digest.add
+    return digest
+
+
+def start_diagnostics():
+    """Сервер метрик и запись ответов API, если они включены."""
+    if metrics.METRICS_PORT:
+        metrics.start_server()
+    if traffic.RECORD_FILE:
+        traffic.start()
+
+
+def stop(tracker, server=None, journal=None, digest=None):
+    """Сохранение состояния и освобождение ресурсов при остановке."""
+    if server:
+        server.stop()
+    if digest:
+        digest.stop()
+    tracker.persist()
+    if journal:
+        journal.close()
+    if tracker.store:
+        tracker.store.close()
+    traffic.stop()
+    sessions.shutdown()
+    logging.info(BOT_STOPPED)
+
+
+def configure_logging():
+    """Настройка журнала работы бота."""
     logging.basicConfig(
-        level=logging.DEBUG,
-        format='%(asctime)s, %(levelname)s, %(funcName)s, %(message)s',
-        handlers=[
-            logging.StreamHandler(stream=sys.stdout),
-            logging.FileHandler(__file__ + '.log')
-        ]
+        level=logs.LOG_LEVEL,
+        handlers=[logs.start_pipeline(LOG_FILE)]
     )
-    main()
+
+
+if __name__ == '__main__':
+    if '--startup-profile' in sys.argv[1:]:
+        startup.main()
+    else:
+        configure_logging()
+        main()
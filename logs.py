@@ -0,0 +1,191 @@
+import atexit
+from contextvars import ContextVar
+import json
+import logging
+from logging.handlers import (
+    QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+)
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG')
+LOG_FILE = os.getenv('LOG_FILE')
+LOG_FILE_FORMAT = os.getenv('LOG_FILE_FORMAT', 'json')
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', 5))
+LOG_ROTATE_WHEN = os.getenv('LOG_ROTATE_WHEN')
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+LOG_REPEAT_LIMIT = int(os.getenv('LOG_REPEAT_LIMIT', 3))
+LOG_REPEAT_WINDOW = float(os.getenv('LOG_REPEAT_WINDOW', 300))
+
+TEXT_FORMAT = '%(asctime)s, %(levelname)s, %(funcName)s, %(message)s'
+LOG_REPEAT_KEYS = 1024
+
+REPEATS_SUPPRESSED = (
+    ' (ещё {count} таких же записей за {window:.0f} с пропущено)'
+)
+RECORDS_DROPPED = 'Очередь журнала переполнена, пропущено записей: {count}'
+
+cycle_id = ContextVar('cycle_id', default='-')
+
+
+def new_cycle():
+    """Новый идентификатор цикла опроса для записей журнала."""
+    value = uuid.uuid4().hex[:12]
+    cycle_id.set(value)
+    return value
+
+
+class CycleFilter(logging.Filter):
+    """Добавление идентификатора цикла в запись журнала."""
+
+    def filter(self, record):
+        """Запись всегда пропускается."""
+        record.cycle = cycle_id.get()
+        return True
+
+
+class RepeatFilter(logging.Filter):
+    """Ограничение числа одинаковых записей об ошибках.
+
+    В окне window секунд пропускаются первые limit одинаковых записей
+    уровня WARNING и выше; первая запись после окна сообщает, сколько
+    повторов было пропущено.
+    """
+
+    def __init__(self, limit=LOG_REPEAT_LIMIT, window=LOG_REPEAT_WINDOW,
+                 clock=time.monotonic):
+        """Окно задаётся в секундах."""
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self.clock = clock
+        self.seen = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        """Пропуск или подавление записи."""
+        if record.levelno < logging.WARNING:
+            return True
+        key = (record.levelno, record.getMessage(),
+               record.exc_info and record.exc_info[0])
+        now = self.clock()
+        with self.lock:
+            started, count = self.seen.get(key, (now, 0))
+            if now - started >= self.window:
+                suppressed = count - self.limit
+                started, count = now, 0
+                if suppressed > 0:
+                    record.msg = str(record.msg) + REPEATS_SUPPRESSED.format(
+                        count=suppressed, window=self.window
+                    )
+            self.seen[key] = (started, count + 1)
+            if len(self.seen) > LOG_REPEAT_KEYS:
+                self.seen = {
+                    key: value for key, value in self.seen.items()
+                    if now - value[0] < self.window
+                }
+        return count < self.limit
+
+
+class JsonFormatter(logging.Formatter):
+    """Запись журнала в виде одной строки JSON."""
+
+    def format(self, record):
+        """JSON с временем, уровнем, функцией, циклом и сообщением."""
+        data = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'func': record.funcName,
+            'cycle': getattr(record, 'cycle', '-'),
+            'thread': record.threadName,
+            'message': record.getMessage()
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data['exc'] = record.exc_text
+        return json.dumps(data, ensure_ascii=False)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Передача записей в фоновый поток без ожидания.
+
+    При переполнении очереди запись отбрасывается, а число пропусков
+    сообщается, когда место освободится.
+    """
+
+    def __init__(self, log_queue):
+        """Записи складываются в ограниченную очередь."""
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        """Сообщение и трассировка вычисляются в потоке вызова."""
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(
+                record.exc_info
+            )
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        """Постановка в очередь без блокировки."""
+        try:
+            if self.dropped:
+                self.queue.put_nowait(logging.makeLogRecord({
+                    'name': record.name, 'levelno': logging.WARNING,
+                    'levelname': 'WARNING', 'funcName': 'enqueue',
+                    'msg': RECORDS_DROPPED.format(count=self.dropped)
+                }))
+                self.dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def file_handler(path):
+    """Файловый обработчик с ротацией по размеру или по времени."""
+    if LOG_ROTATE_WHEN:
+        handler = TimedRotatingFileHandler(
+            path, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUP_COUNT,
+            encoding='utf-8'
+        )
+    else:
+        handler = RotatingFileHandler(
+            path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+            encoding='utf-8'
+        )
+    if LOG_FILE_FORMAT == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    return handler
+
+
+def start_pipeline(path, stream=sys.stdout):
+    """Обработчик для корневого логгера и фоновый поток записи.
+
+    Запись в файл и поток вывода выполняется фоновым потоком, поэтому
+    задержки диска не останавливают опрос API.
+    """
+    console = logging.StreamHandler(stream)
+    console.setFormatter(logging.Formatter(TEXT_FORMAT))
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+    handler.addFilter(CycleFilter())
+    handler.addFilter(RepeatFilter())
+    listener = QueueListener(
+        handler.queue, console, file_handler(path),
+        respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    return handler
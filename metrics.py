@@ -0,0 +1,235 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import logging
+import os
+import threading
+import time
+
+
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = os.getenv('METRICS_PORT')
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60
+)
+
+METRICS_STARTED = 'Метрики доступны по адресу http://{host}:{port}/metrics'
+METRIC_FAILURE = 'Не удалось вычислить метрику {name}: {error}'
+
+
+def format_labels(labels):
+    """Метки в формате Prometheus."""
+    if not labels:
+        return ''
+    return '{' + ','.join(
+        '{}="{}"'.format(
+            name, str(value).replace('\\', r'\\').replace('"', r'\"')
+        )
+        for name, value in labels
+    ) + '}'
+
+
+class Metric:
+    """Метрика с необязательными метками."""
+
+    kind = 'untyped'
+
+    def __init__(self, name, documentation):
+        """Имя и описание для страницы /metrics."""
+        self.name = name
+        self.documentation = documentation
+        self.lock = threading.Lock()
+        self.values = {}
+
+    def render(self):
+        """Строки метрики в текстовом формате Prometheus."""
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.kind}'
+        ]
+        with self.lock:
+            items = sorted(self.values.items())
+        for labels, value in items:
+            lines.extend(self.samples(labels, value))
+        return lines
+
+    def samples(self, labels, value):
+        """Строки значений для одного набора меток."""
+        return [f'{self.name}{format_labels(labels)} {value}']
+
+
+class Counter(Metric):
+    """Монотонно растущий счётчик."""
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        """Увеличение счётчика."""
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """Текущее значение, задаваемое явно или функцией."""
+
+    kind = 'gauge'
+
+    def __init__(self, name, documentation):
+        """Функции значений задаются через set_function."""
+        super().__init__(name, documentation)
+        self.functions = {}
+
+    def set(self, value, **labels):
+        """Установка значения."""
+        with self.lock:
+            self.values[tuple(sorted(labels.items()))] = value
+
+    def set_to_current_time(self, **labels):
+        """Значение - текущее время Unix."""
+        self.set(time.time(), **labels)
+
+    def set_function(self, function, **labels):
+        """Значение вычисляется функцией при каждом чтении метрик."""
+        with self.lock:
+            self.functions[tuple(sorted(labels.items()))] = function
+
+    def render(self):
+        """Значения функций пересчитываются перед выводом."""
+        with self.lock:
+            functions = list(self.functions.items())
+        for labels, function in functions:
+            try:
+                value = function()
+            except Exception as error:
+                logging.warning(
+                    METRIC_FAILURE.format(name=self.name, error=error)
+                )
+                continue
+            with self.lock:
+                self.values[labels] = value
+        return super().render()
+
+
+class Histogram(Metric):
+    """Распределение длительностей по корзинам."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, buckets=LATENCY_BUCKETS):
+        """Границы корзин задаются в секундах."""
+        super().__init__(name, documentation)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        """Учёт одного наблюдения."""
+        key = tuple(sorted(labels.items()))
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            counts, total = self.values.get(
+                key, ([0] * (len(self.buckets) + 1), 0.0)
+            )
+            counts[index] += 1
+            self.values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        """Замер длительности блока, в том числе завершившегося ошибкой."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self, labels, value):
+        """Накопительные корзины, сумма и число наблюдений."""
+        counts, total = value
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + ('+Inf',), counts):
+            cumulative += count
+            lines.append('{}_bucket{} {}'.format(
+                self.name, format_labels(labels + (('le', bound),)),
+                cumulative
+            ))
+        lines.append(f'{self.name}_sum{format_labels(labels)} {total}')
+        lines.append(f'{self.name}_count{format_labels(labels)} {cumulative}')
+        return lines
+
+
+API_LATENCY = Histogram(
+    'homework_api_request_seconds',
+    'Длительность запроса к API Практикум.Домашки'
+)
+SEND_LATENCY = Histogram(
+    'homework_send_seconds', 'Длительность отправки сообщения в Telegram'
+)
+CYCLE_DURATION = Histogram(
+    'homework_cycle_seconds', 'Длительность цикла опроса подписки'
+)
+ERRORS = Counter(
+    'homework_errors_total',
+    'Ошибки опроса и отправки сообщений по типу исключения'
+)
+QUEUE_DEPTH = Gauge(
+    'homework_queue_depth', 'Число сообщений в очередях отправки'
+)
+LAST_SUCCESS = Gauge(
+    'homework_last_success_timestamp_seconds',
+    'Время последней успешной операции'
+)
+SEND_FAILURES = Counter(
+    'homework_send_failures_total',
+    'Сообщения, которые не удалось отправить из очереди отправки'
+)
+DEADLINE_OVERRUNS = Counter(
+    'homework_deadline_overruns_total',
+    'Превышения таймаутов и бюджета времени цикла по этапам'
+)
+
+REGISTRY = (
+    API_LATENCY, SEND_LATENCY, CYCLE_DURATION, ERRORS, QUEUE_DEPTH,
+    SEND_FAILURES, LAST_SUCCESS, DEADLINE_OVERRUNS
+)
+
+
+def render(registry=REGISTRY):
+    """Все метрики в текстовом формате Prometheus."""
+    lines = []
+    for metric in registry:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Отдача метрик по адресу /metrics."""
+
+    def do_GET(self):
+        """GET /metrics."""
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        data = render().encode()
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        """Запросы к метрикам не пишутся в журнал."""
+
+
+def start_server(port=METRICS_PORT, host=METRICS_HOST):
+    """Запуск HTTP-сервера метрик в фоновом потоке."""
+    server = ThreadingHTTPServer((host, int(port)), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, daemon=True, name='metrics'
+    ).start()
+    logging.info(METRICS_STARTED.format(
+        host=host, port=server.server_address[1]
+    ))
+    return server
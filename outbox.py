@@ -0,0 +1,204 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import botapi
+import metrics
+
+OUTBOX_FILE = os.getenv('OUTBOX_FILE')
+OUTBOX_RETRY_PERIOD = int(os.getenv('OUTBOX_RETRY_PERIOD', 60))
+OUTBOX_RETRY_MAX = int(os.getenv('OUTBOX_RETRY_MAX', 3600))
+OUTBOX_BATCH = int(os.getenv('OUTBOX_BATCH', 100))
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    chat_id TEXT NOT NULL,
+    text TEXT NOT NULL,
+    created REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    last_error TEXT,
+    delivered REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_pending
+    ON outbox (next_attempt) WHERE delivered IS NULL;
+'''
+
+OUTBOX_FAILURE = ('Сообщение №{message_id} в чат {chat_id} не отправлено '
+                  '(попытка {attempts}), повтор через {delay} с: {error}')
+OUTBOX_RETRY_FAILURE = 'Сбой повторной отправки сообщений: {error}'
+OUTBOX_WRITE_FAILURE = ('Сообщение в чат {chat_id} не записано в журнал '
+                        'исходящих: {error}')
+OUTBOX_DISPATCH_FAILURE = ('Сообщение №{message_id} в чат {chat_id} '
+                           'не передано на отправку, повтор из журнала: '
+                           '{error}')
+
+
+class OutboxError(botapi.TelegramError):
+    """Сообщение не записано в журнал и не передано на отправку.
+
+    Наследует TelegramError, чтобы трекер обработал сбой журнала как
+    неудачную отправку и повторил сообщение в следующем цикле.
+    """
+
+
+class Outbox:
+    """Журнал исходящих сообщений в SQLite с повторной отправкой.
+
+    Сообщение записывается до отправки и помечается доставленным
+    только после успешного ответа Telegram, поэтому сбой или перезапуск
+    не теряет уведомления.
+    """
+
+    def __init__(self, path, send, dispatch=None,
+                 retry_period=OUTBOX_RETRY_PERIOD,
+                 retry_max=OUTBOX_RETRY_MAX, clock=time.time):
+        """send(chat_id, текст) отправляет сообщение в Telegram.
+
+        dispatch(chat_id, текст, номер) позволяет передать доставку
+        в очередь отправки; по умолчанию сообщение доставляется сразу.
+        """
+        self.send = send
+        self.dispatch = dispatch or self.deliver_quietly
+        self.retry_period = retry_period
+        self.retry_max = retry_max
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.executescript(SCHEMA)
+
+    def close(self):
+        """Закрытие базы."""
+        with self.lock:
+            self.connection.close()
+
+    def put(self, chat_id, text):
+        """Запись сообщения в журнал; возвращает его номер.
+
+        До первой попытки отправки сообщение не считается просроченным
+        retry_period секунд, чтобы не отправить его повторно из retry().
+        """
+        now = self.clock()
+        with self.lock, self.connection:
+            cursor = self.connection.execute(
+                'INSERT INTO outbox (chat_id, text, created, next_attempt) '
+                'VALUES (?, ?, ?, ?)',
+                (str(chat_id), text, now, now + self.retry_period)
+            )
+        return cursor.lastrowid
+
+    def submit(self, chat_id, text):
+        """Запись сообщения в журнал и передача его на отправку.
+
+        Записанное сообщение считается принятым: если dispatch не принял
+        его, например очередь отправки переполнена, ошибка только
+        записывается в лог, а сообщение доставит retry().
+        """
+        try:
+            message_id = self.put(chat_id, text)
+        except sqlite3.Error as error:
+            message = OUTBOX_WRITE_FAILURE.format(chat_id=chat_id, error=error)
+            logging.exception(message)
+            metrics.ERRORS.inc(type=OutboxError.__name__)
+            raise OutboxError(message) from None
+        try:
+            self.dispatch(chat_id, text, message_id)
+        except botapi.errors('TelegramError') as error:
+            logging.warning(OUTBOX_DISPATCH_FAILURE.format(
+                message_id=message_id, chat_id=chat_id, error=error
+            ))
+
+    def is_pending(self, message_id):
+        """Сообщение ещё не доставлено."""
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT delivered FROM outbox WHERE id = ?', (message_id,)
+            ).fetchone()
+        return row is not None and row[0] is None
+
+    def deliver(self, chat_id, text, message_id):
+        """Отправка сообщения из журнала с отметкой результата."""
+        if not self.is_pending(message_id):
+            return
+        try:
+            self.send(chat_id, text)
+        except botapi.errors('TelegramError') as error:
+            self.mark_failed(message_id, chat_id, error)
+            raise
+        with self.lock, self.connection:
+            self.connection.execute(
+                'UPDATE outbox SET delivered = ?, attempts = attempts + 1 '
+                'WHERE id = ? AND delivered IS NULL',
+                (self.clock(), message_id)
+            )
+
+    def confirm(self, message_ids):
+        """Отметка о доставке сообщений, отправленных в составе сводки."""
+        now = self.clock()
+        with self.lock, self.connection:
+            self.connection.executemany(
+                'UPDATE outbox SET delivered = ?, attempts = attempts + 1 '
+                'WHERE id = ? AND delivered IS NULL',
+                [(now, message_id) for message_id in message_ids]
+            )
+
+    def deliver_quietly(self, chat_id, text, message_id):
+        """Отправка, при которой ошибка Telegram остаётся в журнале."""
+        try:
+            self.deliver(chat_id, text, message_id)
+        except botapi.errors('TelegramError'):
+            pass
+
+    def mark_failed(self, message_id, chat_id, error):
+        """Учёт неудачной попытки и выбор времени следующей."""
+        with self.lock, self.connection:
+            attempts = self.connection.execute(
+                'SELECT attempts FROM outbox WHERE id = ?', (message_id,)
+            ).fetchone()[0] + 1
+            delay = min(
+                self.retry_max, self.retry_period * 2 ** (attempts - 1)
+            )
+            self.connection.execute(
+                'UPDATE outbox SET attempts = ?, next_attempt = ?, '
+                'last_error = ? WHERE id = ?',
+                (attempts, self.clock() + delay, str(error), message_id)
+            )
+        logging.error(OUTBOX_FAILURE.format(
+            message_id=message_id, chat_id=chat_id, attempts=attempts,
+            delay=delay, error=error
+        ))
+
+    def due(self, limit=OUTBOX_BATCH):
+        """Недоставленные сообщения, время повтора которых наступило."""
+        now = self.clock()
+        with self.lock, self.connection:
+            rows = self.connection.execute(
+                'SELECT id, chat_id, text FROM outbox '
+                'WHERE delivered IS NULL AND next_attempt <= ? '
+                'ORDER BY id LIMIT ?',
+                (now, limit)
+            ).fetchall()
+            self.connection.executemany(
+                'UPDATE outbox SET next_attempt = ? WHERE id = ?',
+                [(now + self.retry_period, row[0]) for row in rows]
+            )
+        return rows
+
+    def retry(self):
+        """Повторная отправка просроченных сообщений."""
+        try:
+            for message_id, chat_id, text in self.due():
+                self.dispatch(chat_id, text, message_id)
+        except Exception as error:
+            logging.exception(OUTBOX_RETRY_FAILURE.format(error=error))
+
+    def pending(self):
+        """Число недоставленных сообщений."""
+        with self.lock:
+            return self.connection.execute(
+                'SELECT COUNT(*) FROM outbox WHERE delivered IS NULL'
+            ).fetchone()[0]
@@ -0,0 +1,147 @@
+import logging
+import os
+import threading
+import time
+
+import botapi
+import deadline
+
+TELEGRAM_GLOBAL_RATE = float(os.getenv('TELEGRAM_GLOBAL_RATE', 30))
+TELEGRAM_GLOBAL_BURST = int(os.getenv('TELEGRAM_GLOBAL_BURST', 30))
+TELEGRAM_CHAT_RATE = float(os.getenv('TELEGRAM_CHAT_RATE', 1))
+TELEGRAM_CHAT_BURST = int(os.getenv('TELEGRAM_CHAT_BURST', 3))
+TELEGRAM_RETRY_LIMIT = int(os.getenv('TELEGRAM_RETRY_LIMIT', 5))
+
+RETRY_AFTER = ('Telegram ограничил отправку в чат {chat_id}, '
+               'повтор через {seconds} с')
+WAIT_EXCEEDED = ('Ожидание лимита отправки ({seconds:.1f} с) не укладывается '
+                 'в бюджет цикла')
+
+
+class TokenBucket:
+    """Корзина токенов: rate токенов в секунду, не более capacity."""
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        """Корзина создаётся полной."""
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Резервирование токена; возвращает, сколько секунд его ждать.
+
+        Токены уходят в минус, поэтому конкурирующие вызовы выстраиваются
+        в очередь, а не теряются.
+        """
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(
+                self.capacity,
+                self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0
+            return -self.tokens / self.rate
+
+    def release(self):
+        """Возврат зарезервированного, но не использованного токена."""
+        with self.lock:
+            self.tokens += 1
+
+    def pause(self, seconds):
+        """Запрет выдачи токенов на ближайшие seconds секунд."""
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.tokens, 0) - seconds * self.rate
+            self.updated = now
+
+
+class RateLimiter:
+    """Ограничение отправки сообщений: общее и для каждого чата."""
+
+    def __init__(self, global_rate=TELEGRAM_GLOBAL_RATE,
+                 global_burst=TELEGRAM_GLOBAL_BURST,
+                 chat_rate=TELEGRAM_CHAT_RATE,
+                 chat_burst=TELEGRAM_CHAT_BURST,
+                 retry_limit=TELEGRAM_RETRY_LIMIT,
+                 clock=time.monotonic, sleep=time.sleep):
+        """Частоты задаются в сообщениях в секунду."""
+        self.global_bucket = TokenBucket(global_rate, global_burst, clock)
+        self.clock = clock
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.retry_limit = retry_limit
+        self.sleep = sleep
+        self.chats = {}
+        self.lock = threading.Lock()
+
+    def chat_bucket(self, chat_id):
+        """Корзина токенов чата."""
+        with self.lock:
+            bucket = self.chats.get(chat_id)
+            if bucket is None:
+                bucket = self.chats[chat_id] = TokenBucket(
+                    self.chat_rate, self.chat_burst, self.clock
+                )
+            return bucket
+
+    def wait(self, delay):
+        """Пауза delay секунд, если она укладывается в бюджет цикла.
+
+        Иначе пауза не начинается: поднимается botapi.TimedOut,
+        а превышение учитывается как превышение этапа send.
+        """
+        budget = deadline.current()
+        if budget is not None and delay > budget.remaining():
+            deadline.overrun('send')
+            raise botapi.TimedOut(WAIT_EXCEEDED.format(seconds=delay))
+        self.sleep(delay)
+
+    def acquire(self, chat_id):
+        """Ожидание права отправить сообщение в чат.
+
+        Если ожидание не укладывается в бюджет цикла, зарезервированные
+        токены возвращаются в корзины.
+        """
+        reserved = []
+        try:
+            for bucket in (self.chat_bucket(chat_id), self.global_bucket):
+                reserved.append(bucket)
+                delay = bucket.reserve()
+                if delay:
+                    self.wait(delay)
+        except botapi.TimedOut:
+            for bucket in reserved:
+                bucket.release()
+            raise
+
+    def send(self, bot, chat_id, message):
+        """Отправка с соблюдением лимитов и повтором после RetryAfter.
+
+        Таймаут каждой попытки ограничен бюджетом текущего цикла; если
+        бюджет исчерпан или ожидание лимита в него не укладывается,
+        поднимается botapi.TimedOut, как при истёкшем таймауте Telegram.
+        """
+        for attempt in range(self.retry_limit + 1):
+            self.acquire(chat_id)
+            try:
+                timeout = deadline.send_timeout()
+            except deadline.DeadlineExceeded as error:
+                raise botapi.TimedOut(str(error)) from None
+            try:
+                return bot.send_message(chat_id, message, timeout=timeout)
+            except botapi.errors('TimedOut'):
+                deadline.overrun('send')
+                raise
+            except botapi.errors('RetryAfter') as error:
+                if attempt == self.retry_limit:
+                    raise
+                logging.warning(RETRY_AFTER.format(
+                    chat_id=chat_id, seconds=error.retry_after
+                ))
+                self.chat_bucket(chat_id).pause(error.retry_after)
@@ -0,0 +1,87 @@
+from enum import Enum
+import sys
+
+
+ERROR_API_KEY = ('В ответе API Практикум.Домашки'
+                 'нет ключа `homework_name`')
+ERROR_API_STATUS = 'В ответе Практикум.Домашки не указан статус задания'
+
+
+class Status(str, Enum):
+    """Статус проверки работы; равен своей строке из ответа API."""
+
+    APPROVED = 'approved'
+    REVIEWING = 'reviewing'
+    REJECTED = 'rejected'
+
+
+STATUSES = {status.value: status for status in Status}
+
+
+def intern_status(value):
+    """Общий объект статуса вместо отдельной строки в каждом ответе.
+
+    Неизвестный статус сохраняется как строка, чтобы ошибку о нём
+    сообщил parse_status.
+    """
+    status = STATUSES.get(value)
+    if status is not None:
+        return status
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Homework:
+    """Домашняя работа из ответа API без неиспользуемых полей.
+
+    Поля называются как ключи ответа, а get() читает их так же, как
+    dict.get(), поэтому запись принимают функции, работающие со словарями.
+    """
+
+    __slots__ = ('id', 'homework_name', 'status', 'date_updated')
+
+    def __init__(self, id, homework_name, status, date_updated=None):
+        """Статус приводится к Status."""
+        self.id = id
+        self.homework_name = homework_name
+        self.status = intern_status(status)
+        self.date_updated = date_updated
+
+    @classmethod
+    def from_dict(cls, data):
+        """Запись из элемента списка homeworks с проверкой ключей."""
+        if 'homework_name' not in data:
+            raise KeyError(ERROR_API_KEY)
+        if 'status' not in data:
+            raise KeyError(ERROR_API_STATUS)
+        return cls(
+            data.get('id'), data['homework_name'], data['status'],
+            data.get('date_updated')
+        )
+
+    def get(self, field, default=None):
+        """Значение поля; для отсутствующего или пустого - default."""
+        value = getattr(self, field, None)
+        return default if value is None else value
+
+    def __eq__(self, other):
+        """Записи равны, если равны все поля."""
+        if not isinstance(other, Homework):
+            return NotImplemented
+        return all(
+            getattr(self, field) == getattr(other, field)
+            for field in self.__slots__
+        )
+
+    def __repr__(self):
+        """Представление для журнала и отладки."""
+        return 'Homework({})'.format(', '.join(
+            f'{field}={getattr(self, field)!r}' for field in self.__slots__
+        ))
+
+
+def parse_homeworks(items):
+    """Записи для всех работ из ответа API."""
+    return [
+        item if isinstance(item, Homework) else Homework.from_dict(item)
+        for item in items
+    ]
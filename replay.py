@@ -0,0 +1,117 @@
+import argparse
+import json
+import logging
+import time
+
+import botapi
+import homework
+import traffic
+
+
+REPLAY_TOKEN = 'replay'
+
+REPLAY_ERROR = 'Записанный запрос завершился ошибкой {error}'
+REPORT = ('ответов: {entries}, подписок: {tenants}, сообщений: {messages}, '
+          'ошибок ответа: {errors}, время: {elapsed:.3f} с, '
+          '{throughput:.1f} ответов/с')
+
+
+class Replay:
+    """Прогон записанных ответов API через трекеры подписок.
+
+    Для каждой подписки из журнала создаётся свой Tracker, поэтому ответы
+    проходят те же check_response, parse_status и отправку, что и при
+    опросе API. speed задаёт ускорение пауз между ответами, 0 - без пауз.
+    """
+
+    def __init__(self, send, speed=0, sleep=time.sleep):
+        """send(подписка, текст) получает сообщения трекеров."""
+        self.send = send
+        self.speed = speed
+        self.sleep = sleep
+        self.trackers = {}
+        self.entry = None
+
+    def fetch(self, time):
+        """Ответ API из текущей записи журнала."""
+        entry = self.entry
+        if 'error' in entry:
+            raise ConnectionError(REPLAY_ERROR.format(error=entry['error']))
+        return homework.read_response(
+            entry['status'], lambda: json.loads(entry['body']),
+            {'url': homework.ENDPOINT, 'headers': {},
+             'params': {'from_date': time}}
+        )
+
+    def tracker(self, tenant):
+        """Трекер подписки; создаётся при первом ответе для неё."""
+        tracker = self.trackers.get(tenant)
+        if tracker is None:
+            tracker = self.trackers[tenant] = homework.Tracker(
+                self.fetch, lambda message: self.send(tenant, message)
+            )
+        return tracker
+
+    def wait(self, entry, previous):
+        """Пауза между ответами, ускоренная в speed раз."""
+        if self.speed and previous is not None:
+            self.sleep(max(0, entry['time'] - previous['time']) / self.speed)
+
+    def run(self, entries):
+        """Прогон журнала; возвращает сводку."""
+        stats = {'entries': 0, 'errors': 0}
+        previous = None
+        started = time.perf_counter()
+        for entry in entries:
+            self.wait(entry, previous)
+            self.entry = previous = entry
+            self.tracker(entry['tenant']).poll()
+            stats['entries'] += 1
+            if entry.get('status') != 200:
+                stats['errors'] += 1
+        elapsed = time.perf_counter() - started
+        stats.update(
+            tenants=len(self.trackers),
+            elapsed=elapsed,
+            throughput=stats['entries'] / elapsed if elapsed else 0.0
+        )
+        return stats
+
+
+def parse_args(argv=None):
+    """Параметры командной строки."""
+    parser = argparse.ArgumentParser(
+        description='Воспроизведение записанных ответов API Практикум.Домашки'
+    )
+    parser.add_argument('journal', help='журнал, записанный с RECORD_FILE')
+    parser.add_argument('--speed', type=float, default=0,
+                        help='ускорение пауз между ответами, 0 - без пауз')
+    parser.add_argument('--telegram-url',
+                        help='адрес Bot API для отправки сообщений, '
+                             'например заглушки fake_api.py')
+    parser.add_argument('--chat-id', default='1',
+                        help='чат для сообщений при --telegram-url')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Воспроизведение журнала из командной строки."""
+    args = parse_args(argv)
+    messages = []
+    if args.telegram_url:
+        bot = botapi.BotClient(REPLAY_TOKEN, args.telegram_url)
+
+        def send(tenant, message):
+            messages.append(message)
+            bot.send_message(args.chat_id, message)
+    else:
+        def send(tenant, message):
+            messages.append(message)
+    stats = Replay(send, args.speed).run(traffic.read(args.journal))
+    print(REPORT.format(messages=len(messages), **stats))
+    return stats
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    main()
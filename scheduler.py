@@ -0,0 +1,70 @@
+import os
+import random
+
+from status_index import homework_key
+
+
+POLL_IDLE_PERIOD = int(os.getenv('POLL_IDLE_PERIOD', 600))
+POLL_ACTIVE_PERIOD = int(os.getenv('POLL_ACTIVE_PERIOD', 120))
+POLL_MIN_PERIOD = int(os.getenv('POLL_MIN_PERIOD', 60))
+POLL_MAX_PERIOD = int(os.getenv('POLL_MAX_PERIOD', 3600))
+
+ACTIVE_STATUSES = ('reviewing',)
+
+ERROR_BOUNDS = ('Минимальный период опроса {minimum} больше '
+                'максимального {maximum}')
+
+
+class Scheduler:
+    """Выбор паузы между опросами API по состоянию работ и ошибкам."""
+
+    def __init__(self, idle=POLL_IDLE_PERIOD, active=POLL_ACTIVE_PERIOD,
+                 minimum=POLL_MIN_PERIOD, maximum=POLL_MAX_PERIOD):
+        """Периоды опроса и их границы задаются в секундах."""
+        if minimum > maximum:
+            raise ValueError(ERROR_BOUNDS.format(
+                minimum=minimum, maximum=maximum
+            ))
+        self.idle = idle
+        self.active = active
+        self.minimum = minimum
+        self.maximum = maximum
+        self.failures = 0
+        self.retry_after = None
+        self.in_flight = set()
+
+    def observe(self, homeworks):
+        """Учёт работ, которые сейчас находятся на проверке."""
+        for homework in homeworks or ():
+            key = homework_key(homework)
+            if homework.get('status') in ACTIVE_STATUSES:
+                self.in_flight.add(key)
+            else:
+                self.in_flight.discard(key)
+
+    def success(self):
+        """Успешный запрос сбрасывает счётчик ошибок."""
+        self.failures = 0
+        self.retry_after = None
+
+    def failure(self, retry_after=None):
+        """Очередная ошибка подряд увеличивает паузу.
+
+        retry_after - пауза, запрошенная API, в секундах: следующий опрос
+        будет не раньше неё, но не позже максимального периода.
+        """
+        self.failures += 1
+        self.retry_after = retry_after
+
+    def next_delay(self):
+        """Пауза до следующего опроса в секундах."""
+        if self.failures:
+            delay = min(self.maximum, self.idle * 2 ** self.failures)
+            delay = random.uniform(delay / 2, delay)
+        elif self.in_flight:
+            delay = self.active
+        else:
+            delay = self.idle
+        if self.retry_after is not None:
+            delay = max(delay, self.retry_after)
+        return max(self.minimum, min(self.maximum, delay))
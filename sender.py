@@ -0,0 +1,139 @@
+import logging
+import os
+import queue
+import threading
+import time
+
+import botapi
+import metrics
+
+
+SEND_QUEUE_SIZE = int(os.getenv('SEND_QUEUE_SIZE', 1000))
+SEND_WORKERS = int(os.getenv('SEND_WORKERS', 2))
+SEND_QUEUE_TIMEOUT = float(os.getenv('SEND_QUEUE_TIMEOUT', 30))
+SEND_DRAIN_TIMEOUT = float(os.getenv('SEND_DRAIN_TIMEOUT', 20))
+
+QUEUE_FULL = ('Очередь отправки переполнена ({size} сообщений), '
+              'сообщение в чат {chat_id} не принято')
+QUEUE_CLOSED = 'Очередь отправки закрыта'
+SEND_FAILURE = 'Не удалось отправить сообщение в чат {chat_id}: {error}'
+DRAIN_INCOMPLETE = 'Очередь отправки не опустела: осталось {count} сообщений'
+
+_STOP = object()
+
+
+class SendQueueFull(botapi.TelegramError):
+    """Очередь отправки не приняла сообщение за отведённое время."""
+
+
+class SendQueue:
+    """Ограниченная очередь сообщений с фоновыми потоками отправки."""
+
+    def __init__(self, send, size=SEND_QUEUE_SIZE, workers=SEND_WORKERS,
+                 timeout=SEND_QUEUE_TIMEOUT):
+        """send(chat_id, текст, *extra) выполняется в потоках-отправителях.
+
+        В extra передаются дополнительные аргументы submit, например
+        номер сообщения в журнале исходящих.
+        """
+        self.send = send
+        self.size = size
+        self.timeout = timeout
+        self.queue = queue.Queue(maxsize=size)
+        self.threads = [
+            threading.Thread(target=self.work, daemon=True,
+                             name=f'sender-{number}')
+            for number in range(workers)
+        ]
+        self.closed = False
+        self.sent = 0
+        self.failed = 0
+        self.peak_depth = 0
+        self.lock = threading.Lock()
+
+    def start(self):
+        """Запуск потоков-отправителей."""
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def depth(self):
+        """Число сообщений, ожидающих отправки."""
+        return self.queue.qsize()
+
+    def stats(self):
+        """Счётчики очереди для мониторинга."""
+        with self.lock:
+            return {
+                'depth': self.depth(),
+                'peak_depth': self.peak_depth,
+                'sent': self.sent,
+                'failed': self.failed
+            }
+
+    def submit(self, chat_id, message, *extra):
+        """Постановка сообщения в очередь.
+
+        Если очередь заполнена, вызов ждёт освобождения места не дольше
+        timeout секунд, после чего выбрасывает SendQueueFull.
+        """
+        if self.closed:
+            metrics.ERRORS.inc(type=SendQueueFull.__name__)
+            raise SendQueueFull(QUEUE_CLOSED)
+        try:
+            self.queue.put(
+                (chat_id, message, *extra), timeout=self.timeout
+            )
+        except queue.Full:
+            metrics.ERRORS.inc(type=SendQueueFull.__name__)
+            raise SendQueueFull(QUEUE_FULL.format(
+                size=self.size, chat_id=chat_id
+            ))
+        with self.lock:
+            self.peak_depth = max(self.peak_depth, self.depth())
+
+    def work(self):
+        """Цикл потока-отправителя."""
+        while True:
+            item = self.queue.get()
+            try:
+                if item is _STOP:
+                    return
+                chat_id, message, *extra = item
+                try:
+                    self.send(chat_id, message, *extra)
+                except Exception as error:
+                    logging.exception(SEND_FAILURE.format(
+                        chat_id=chat_id, error=error
+                    ))
+                    with self.lock:
+                        self.failed += 1
+                    metrics.SEND_FAILURES.inc()
+                else:
+                    with self.lock:
+                        self.sent += 1
+            finally:
+                self.queue.task_done()
+
+    def drain(self, timeout=SEND_DRAIN_TIMEOUT):
+        """Отправка оставшихся сообщений и остановка потоков.
+
+        Возвращает число сообщений, не отправленных за timeout секунд.
+        """
+        self.closed = True
+        deadline = time.monotonic() + timeout
+        for _ in self.threads:
+            try:
+                self.queue.put(
+                    _STOP, timeout=max(0, deadline - time.monotonic())
+                )
+            except queue.Full:
+                break
+        for thread in self.threads:
+            thread.join(max(0, deadline - time.monotonic()))
+        remaining = sum(
+            1 for item in list(self.queue.queue) if item is not _STOP
+        )
+        if remaining:
+            logging.warning(DRAIN_INCOMPLETE.format(count=remaining))
+        return remaining
@@ -0,0 +1,58 @@
+import logging
+import os
+import threading
+
+from startup import lazy_import
+
+
+requests = lazy_import('requests')
+
+HTTP_POOL_HOSTS = int(os.getenv('HTTP_POOL_HOSTS', 4))
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', 16))
+HTTP_POOL_BLOCK = os.getenv('HTTP_POOL_BLOCK', 'true').lower() == 'true'
+
+POOL_STARTED = ('Открыт пул HTTP-соединений: хостов {hosts}, '
+                'соединений на хост {size}')
+POOL_CLOSED = 'Пул HTTP-соединений закрыт'
+
+_session = None
+_lock = threading.Lock()
+
+
+def startup(pool_size=HTTP_POOL_SIZE, hosts=HTTP_POOL_HOSTS,
+            block=HTTP_POOL_BLOCK):
+    """Открытие общей keep-alive сессии с пулом соединений.
+
+    pool_size ограничивает число соединений к одному хосту, hosts - число
+    хостов, для которых пулы хранятся одновременно. При block=True запрос
+    ждёт освободившееся соединение вместо открытия лишнего.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=hosts,
+                pool_maxsize=pool_size,
+                pool_block=block
+            )
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+            logging.debug(POOL_STARTED.format(hosts=hosts, size=pool_size))
+        return _session
+
+
+def shutdown():
+    """Закрытие общей сессии и всех её соединений."""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+            logging.debug(POOL_CLOSED)
+
+
+def client():
+    """Общая сессия, а если пул не открыт - сам модуль requests."""
+    return _session or requests
@@ -0,0 +1,47 @@
+from bisect import bisect
+import hashlib
+import os
+
+
+ENGINE_SHARD = int(os.getenv('ENGINE_SHARD', 0))
+ENGINE_SHARDS = int(os.getenv('ENGINE_SHARDS', 1))
+VIRTUAL_NODES = int(os.getenv('VIRTUAL_NODES', 160))
+
+
+def ring_hash(key):
+    """Положение ключа на кольце."""
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], 'big')
+
+
+class HashRing:
+    """Консистентное хэширование ключей по процессам.
+
+    Каждый процесс занимает replicas точек кольца; при изменении числа
+    процессов к другому процессу переходит лишь часть ключей.
+    """
+
+    def __init__(self, shards, replicas=VIRTUAL_NODES):
+        """Процессы нумеруются от 0 до shards - 1."""
+        points = sorted(
+            (ring_hash(f'shard-{shard}#{replica}'), shard)
+            for shard in range(shards)
+            for replica in range(replicas)
+        )
+        self.hashes = [point for point, _ in points]
+        self.shards = [shard for _, shard in points]
+
+    def shard(self, key):
+        """Номер процесса, которому принадлежит ключ."""
+        index = bisect(self.hashes, ring_hash(key)) % len(self.hashes)
+        return self.shards[index]
+
+
+def assigned(subscriptions, shard=ENGINE_SHARD, shards=ENGINE_SHARDS):
+    """Подписки, которые обслуживает процесс shard из shards."""
+    if shards <= 1:
+        return list(subscriptions)
+    ring = HashRing(shards)
+    return [
+        subscription for subscription in subscriptions
+        if ring.shard(subscription.chat_id) == shard
+    ]
@@ -0,0 +1,79 @@
+from contextlib import contextmanager
+import logging
+import os
+import signal
+import threading
+
+
+SHUTDOWN_TIMEOUT = float(os.getenv('SHUTDOWN_TIMEOUT', 20))
+SIGNALS = (signal.SIGTERM, signal.SIGINT)
+
+SHUTDOWN_REQUESTED = 'Получен сигнал {signal}, бот завершает работу'
+SHUTDOWN_FORCED = 'Цикл опроса не завершился за {timeout:.0f} с, прерывание'
+
+
+class Stop(BaseException):
+    """Остановка бота по сигналу."""
+
+
+class Shutdown:
+    """Обработка SIGTERM и SIGINT с прерыванием ожидания.
+
+    Сигнал во время паузы между циклами прерывает её сразу. Сигнал во время
+    цикла опроса даёт ему закончиться, но не дольше timeout секунд: затем
+    цикл прерывается повторным сигналом.
+    """
+
+    def __init__(self, timeout=SHUTDOWN_TIMEOUT, signals=SIGNALS):
+        """Обработчики ставятся при входе в контекст."""
+        self.timeout = timeout
+        self.signals = signals
+        self.requested = threading.Event()
+        self.sleeping = False
+        self.previous = {}
+        self.deadline = None
+
+    def __enter__(self):
+        """Установка обработчиков сигналов."""
+        for signum in self.signals:
+            self.previous[signum] = signal.signal(signum, self.handle)
+        return self
+
+    def __exit__(self, *exc_info):
+        """Восстановление прежних обработчиков."""
+        if self.deadline:
+            self.deadline.cancel()
+        for signum, handler in self.previous.items():
+            signal.signal(signum, handler)
+        self.previous = {}
+        return exc_info[0] is Stop
+
+    def handle(self, signum, frame):
+        """Обработчик сигнала."""
+        if not self.requested.is_set():
+            logging.info(SHUTDOWN_REQUESTED.format(
+                signal=signal.Signals(signum).name
+            ))
+            self.requested.set()
+            if not self.sleeping:
+                self.deadline = threading.Timer(self.timeout, self.force)
+                self.deadline.daemon = True
+                self.deadline.start()
+                return
+        raise Stop
+
+    def force(self):
+        """Прерывание затянувшегося цикла опроса."""
+        logging.warning(SHUTDOWN_FORCED.format(timeout=self.timeout))
+        os.kill(os.getpid(), self.signals[0])
+
+    @contextmanager
+    def interruptible(self):
+        """Блок, который сигнал прерывает немедленно."""
+        if self.requested.is_set():
+            raise Stop
+        self.sleeping = True
+        try:
+            yield
+        finally:
+            self.sleeping = False
@@ -0,0 +1,163 @@
+import argparse
+from contextlib import contextmanager
+import importlib
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+PROFILE_LIMIT = 15
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+IMPORTS_HEADER = 'Импорт модулей (python -X importtime), мс:'
+IMPORT_ROW = '{cumulative:>10.1f} {own:>10.1f}  {name}'
+STAGES_HEADER = 'Этапы запуска, мс:'
+STAGE_ROW = '{duration:>10.1f}  {name}'
+STAGE_FAILED = '{duration:>10.1f}  {name}: {error}'
+
+
+def lazy_import(name):
+    """Модуль, который загружается при первом обращении к атрибуту.
+
+    Уже загруженный модуль возвращается как есть.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f'No module named {name!r}', name=name)
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def parse_importtime(output):
+    """Строки -X importtime: (модуль, собственное, общее время в мс)."""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        if not own.strip().isdigit():
+            continue
+        modules.append(
+            (name.strip(), int(own) / 1000, int(cumulative) / 1000)
+        )
+    return modules
+
+
+def profile_imports(module='homework'):
+    """Время импорта модулей в отдельном процессе, по убыванию."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True, check=False
+    )
+    return sorted(
+        parse_importtime(result.stderr), key=lambda row: row[2],
+        reverse=True
+    )
+
+
+@contextmanager
+def stage(stages, name):
+    """Замер одного этапа запуска; ошибка этапа тоже записывается."""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as error:
+        stages.append((name, time.perf_counter() - started, error))
+    else:
+        stages.append((name, time.perf_counter() - started, None))
+
+
+def measure_stages():
+    """Этапы запуска бота до первого запроса к API в текущем процессе.
+
+    Создаётся клиент Bot API, выбранный переменной TELEGRAM_CLIENT.
+    """
+    stages = []
+    with stage(stages, 'import homework'):
+        homework = importlib.import_module('homework')
+    with stage(stages, 'check_tokens'):
+        homework.check_tokens()
+    if homework.botapi.TELEGRAM_CLIENT == 'native':
+        with stage(stages, 'botapi.BotClient'):
+            homework.botapi.BotClient(homework.TELEGRAM_TOKEN)
+    else:
+        with stage(stages, 'import telegram'):
+            homework.telegram.Bot
+        with stage(stages, 'telegram.Bot'):
+            homework.telegram.Bot(token=homework.TELEGRAM_TOKEN)
+    with stage(stages, 'import requests'):
+        homework.requests.get
+    return stages
+
+
+def print_stages():
+    """Этапы запуска в формате JSON для profile_stages()."""
+    print(json.dumps([
+        [name, duration, error and str(error)]
+        for name, duration, error in measure_stages()
+    ]))
+
+
+def profile_stages():
+    """Этапы запуска бота в отдельном процессе.
+
+    В текущем процессе модули бота уже загружены, и импорт homework
+    занял бы лишь долю настоящего времени холодного запуска.
+    """
+    result = subprocess.run(
+        [sys.executable, '-c', 'import startup; startup.print_stages()'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return [
+        (name, duration, error)
+        for name, duration, error in json.loads(
+            result.stdout.splitlines()[-1]
+        )
+    ]
+
+
+def report(imports, stages, limit=PROFILE_LIMIT):
+    """Строки отчёта о времени запуска."""
+    lines = [IMPORTS_HEADER]
+    for name, own, cumulative in imports[:limit]:
+        lines.append(IMPORT_ROW.format(
+            cumulative=cumulative, own=own, name=name
+        ))
+    lines.append(STAGES_HEADER)
+    for name, duration, error in stages:
+        row = STAGE_FAILED if error else STAGE_ROW
+        lines.append(row.format(
+            name=name, duration=duration * 1000, error=error
+        ))
+    return lines
+
+
+def parse_args(argv=None):
+    """Параметры командной строки."""
+    parser = argparse.ArgumentParser(
+        description='Время импорта модулей и этапов запуска бота'
+    )
+    parser.add_argument('--startup-profile', action='store_true')
+    parser.add_argument('--limit', type=int, default=PROFILE_LIMIT,
+                        help='число самых медленных модулей в отчёте')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Вывод отчёта о времени запуска."""
+    args = parse_args(argv)
+    for line in report(profile_imports(), profile_stages(), args.limit):
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+from records import intern_status
+
+
+def homework_key(homework):
+    """Ключ домашней работы: id, а при его отсутствии название."""
+    return str(homework.get('id', homework.get('homework_name')))
+
+
+class StatusIndex:
+    """Последние известные статус и дата обновления каждой работы."""
+
+    def __init__(self, entries=None, names=None):
+        """Индекс из словаря {ключ: (статус, date_updated)}.
+
+        names - названия работ по ключам, чтобы сообщить статус работы
+        без её записи из ответа API.
+        """
+        self.entries = {}
+        self.names = {str(key): name for key, name in (names or {}).items()}
+        for key, entry in (entries or {}).items():
+            if isinstance(entry, str):
+                entry = (entry, None)
+            status, date_updated = entry
+            self.entries[str(key)] = (intern_status(status), date_updated)
+
+    def __len__(self):
+        """Число известных работ."""
+        return len(self.entries)
+
+    def is_changed(self, homework):
+        """Новая работа, новый статус или повторная проверка."""
+        known = self.entries.get(homework_key(homework))
+        if known is None:
+            return True
+        status, date_updated = known
+        if homework.get('status') != status:
+            return True
+        updated = homework.get('date_updated')
+        return bool(updated and date_updated and updated > date_updated)
+
+    def changes(self, homeworks):
+        """Работы с реальными изменениями, от старых к новым."""
+        return sorted(
+            (homework for homework in homeworks if self.is_changed(homework)),
+            key=lambda homework: homework.get('date_updated') or ''
+        )
+
+    def update(self, homework):
+        """Запоминание статуса и названия работы."""
+        key = homework_key(homework)
+        self.entries[key] = (
+            intern_status(homework.get('status')), homework.get('date_updated')
+        )
+        self.names[key] = homework.get('homework_name', key)
+
+    def name(self, key):
+        """Название работы; для работ без названия - её ключ."""
+        return self.names.get(str(key), str(key))
+
+    def status(self, key):
+        """Последний известный статус работы или None."""
+        return self.entries.get(str(key), (None, None))[0]
+
+    def to_dict(self):
+        """Представление индекса для контрольной точки."""
+        return {key: list(entry) for key, entry in self.entries.items()}
@@ -0,0 +1,170 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from status_index import homework_key
+
+
+STORE_FILE = os.getenv('STORE_FILE')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS subscriptions (
+    tenant TEXT PRIMARY KEY,
+    practicum_token TEXT,
+    chat_id TEXT NOT NULL,
+    added REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS transitions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tenant TEXT NOT NULL,
+    homework TEXT NOT NULL,
+    previous TEXT,
+    status TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    recorded REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transitions_homework
+    ON transitions (tenant, homework);
+CREATE INDEX IF NOT EXISTS transitions_updated
+    ON transitions (tenant, updated_at);
+CREATE TABLE IF NOT EXISTS deliveries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tenant TEXT NOT NULL,
+    homework TEXT,
+    text TEXT NOT NULL,
+    sent REAL NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS deliveries_sent ON deliveries (tenant, sent);
+'''
+
+STORE_FAILURE = 'Не удалось записать историю в {path}: {error}'
+
+
+class Store:
+    """История статусов, доставок и подписки в SQLite.
+
+    Записи копятся в памяти и пишутся одной транзакцией в flush(),
+    который трекер вызывает в конце цикла опроса. База работает в режиме
+    WAL, поэтому чтение истории не блокирует запись.
+    """
+
+    def __init__(self, path, clock=time.time):
+        """База создаётся при первом открытии."""
+        self.path = path
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.transitions = []
+        self.deliveries = []
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute('PRAGMA synchronous=NORMAL')
+            self.connection.executescript(SCHEMA)
+
+    def close(self):
+        """Запись накопленного и закрытие базы."""
+        self.flush()
+        with self.lock:
+            self.connection.close()
+
+    def save_subscriptions(self, subscriptions):
+        """Добавление или обновление подписок."""
+        now = self.clock()
+        with self.lock, self.connection:
+            self.connection.executemany(
+                'INSERT INTO subscriptions '
+                '(tenant, practicum_token, chat_id, added) '
+                'VALUES (?, ?, ?, ?) ON CONFLICT (tenant) DO UPDATE SET '
+                'practicum_token = excluded.practicum_token, '
+                'chat_id = excluded.chat_id',
+                [
+                    (name, token, str(chat_id), now)
+                    for name, token, chat_id in subscriptions
+                ]
+            )
+
+    def subscriptions(self):
+        """Подписки в порядке добавления: (имя, токен, чат)."""
+        with self.lock:
+            return self.connection.execute(
+                'SELECT tenant, practicum_token, chat_id FROM subscriptions '
+                'ORDER BY added, tenant'
+            ).fetchall()
+
+    def add_transition(self, tenant, homework, previous):
+        """Изменение статуса работы; пишется при flush()."""
+        with self.lock:
+            self.transitions.append((
+                tenant, homework_key(homework), previous,
+                homework.get('status'),
+                homework.get('date_updated') or time.strftime(
+                    '%Y-%m-%dT%H:%M:%SZ', time.gmtime()
+                ),
+                self.clock()
+            ))
+
+    def add_delivery(self, tenant, key, text, error=None):
+        """Сообщение, переданное на отправку; пишется при flush()."""
+        with self.lock:
+            self.deliveries.append((
+                tenant, key, text, self.clock(),
+                None if error is None else str(error)
+            ))
+
+    def flush(self):
+        """Запись накопленных событий одной транзакцией.
+
+        При ошибке записи события остаются в памяти до следующего вызова.
+        """
+        with self.lock:
+            if not (self.transitions or self.deliveries):
+                return
+            try:
+                with self.connection:
+                    self.connection.executemany(
+                        'INSERT INTO transitions (tenant, homework, '
+                        'previous, status, updated_at, recorded) '
+                        'VALUES (?, ?, ?, ?, ?, ?)', self.transitions
+                    )
+                    self.connection.executemany(
+                        'INSERT INTO deliveries '
+                        '(tenant, homework, text, sent, error) '
+                        'VALUES (?, ?, ?, ?, ?)', self.deliveries
+                    )
+            except sqlite3.Error as error:
+                logging.exception(
+                    STORE_FAILURE.format(path=self.path, error=error)
+                )
+                return
+            self.transitions = []
+            self.deliveries = []
+
+    def history(self, tenant, homework=None, limit=50):
+        """Последние изменения статусов подписки, от новых к старым.
+
+        Возвращает строки (работа, прежний статус, статус, дата).
+        """
+        query = (
+            'SELECT homework, previous, status, updated_at FROM transitions '
+            'WHERE tenant = ?'
+        )
+        params = [tenant]
+        if homework is not None:
+            query += ' AND homework = ?'
+            params.append(str(homework))
+        query += ' ORDER BY updated_at DESC, id DESC LIMIT ?'
+        params.append(limit)
+        with self.lock:
+            return self.connection.execute(query, params).fetchall()
+
+    def delivered(self, tenant, limit=50):
+        """Последние сообщения подписки: (работа, текст, время, ошибка)."""
+        with self.lock:
+            return self.connection.execute(
+                'SELECT homework, text, sent, error FROM deliveries '
+                'WHERE tenant = ? ORDER BY sent DESC, id DESC LIMIT ?',
+                (tenant, limit)
+            ).fetchall()
@@ -0,0 +1,165 @@
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import time
+
+import homework
+import metrics
+import outbox
+import ratelimit
+import shutdown
+
+
+ENGINE_WORKERS = int(os.getenv('ENGINE_WORKERS', os.cpu_count() or 1))
+RESTART_DELAY = float(os.getenv('RESTART_DELAY', 1))
+RESTART_DELAY_MAX = float(os.getenv('RESTART_DELAY_MAX', 60))
+RESTART_RESET = float(os.getenv('RESTART_RESET', 60))
+SUPERVISOR_PERIOD = 0.5
+ENGINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'engine.py')
+
+WORKER_STARTED = 'Процесс {index} запущен, pid {pid}'
+WORKER_EXITED = 'Процесс {index} завершился с кодом {code}'
+WORKER_RESTART = 'Процесс {index} будет перезапущен через {delay:.0f} с'
+WORKERS_STOPPED = 'Все процессы остановлены'
+
+
+class Worker:
+    """Дочерний процесс engine.py, обслуживающий одну долю подписок."""
+
+    def __init__(self, index, env):
+        """Переменные окружения процесса и счётчик падений."""
+        self.index = index
+        self.env = env
+        self.process = None
+        self.started = None
+        self.failures = 0
+        self.next_start = 0.0
+        self.finished = False
+
+
+def worker_env(index, workers, environ=os.environ):
+    """Окружение процесса index из workers.
+
+    Глобальный лимит Telegram делится между процессами; журнал исходящих,
+    файл логов и порт метрик у каждого процесса свои. Команды бота
+    отключены: получать обновления может только один процесс.
+    """
+    env = dict(environ)
+    env['ENGINE_SHARD'] = str(index)
+    env['ENGINE_SHARDS'] = str(workers)
+    env['BOT_COMMANDS'] = 'false'
+    env['LOG_FILE'] = f'{homework.LOG_FILE}.{index}'
+    env['TELEGRAM_GLOBAL_RATE'] = str(
+        ratelimit.TELEGRAM_GLOBAL_RATE / workers
+    )
+    env['TELEGRAM_GLOBAL_BURST'] = str(
+        max(1, ratelimit.TELEGRAM_GLOBAL_BURST // workers)
+    )
+    if outbox.OUTBOX_FILE:
+        env['OUTBOX_FILE'] = f'{outbox.OUTBOX_FILE}.{index}'
+    if metrics.METRICS_PORT:
+        env['METRICS_PORT'] = str(int(metrics.METRICS_PORT) + index)
+    return env
+
+
+class Supervisor:
+    """Запуск, наблюдение и перезапуск процессов engine.py.
+
+    Упавший процесс перезапускается с растущей паузой; процесс,
+    завершившийся с кодом 0 (например, без подписок), не перезапускается.
+    """
+
+    def __init__(self, workers=ENGINE_WORKERS,
+                 command=(sys.executable, ENGINE), clock=time.monotonic):
+        """Подписки делятся между workers процессами command."""
+        self.command = list(command)
+        self.clock = clock
+        self.workers = [
+            Worker(index, worker_env(index, workers))
+            for index in range(workers)
+        ]
+
+    def start(self, worker):
+        """Запуск процесса."""
+        worker.process = subprocess.Popen(self.command, env=worker.env)
+        worker.started = self.clock()
+        logging.info(WORKER_STARTED.format(
+            index=worker.index, pid=worker.process.pid
+        ))
+
+    def check(self, worker):
+        """Перезапуск завершившегося процесса, когда подошёл срок."""
+        if worker.finished:
+            return
+        if worker.process is None:
+            if self.clock() >= worker.next_start:
+                self.start(worker)
+            return
+        code = worker.process.poll()
+        if code is None:
+            return
+        logging.warning(WORKER_EXITED.format(index=worker.index, code=code))
+        worker.process = None
+        if code == 0:
+            worker.finished = True
+            return
+        if self.clock() - worker.started >= RESTART_RESET:
+            worker.failures = 0
+        delay = min(RESTART_DELAY_MAX, RESTART_DELAY * 2 ** worker.failures)
+        worker.failures += 1
+        worker.next_start = self.clock() + delay
+        logging.info(WORKER_RESTART.format(index=worker.index, delay=delay))
+
+    def alive(self):
+        """Есть ли процессы, которые работают или ждут перезапуска."""
+        return any(not worker.finished for worker in self.workers)
+
+    def stop(self, timeout=shutdown.SHUTDOWN_TIMEOUT):
+        """Остановка всех процессов: SIGTERM, затем SIGKILL по таймауту."""
+        running = [
+            worker.process for worker in self.workers
+            if worker.process is not None and worker.process.poll() is None
+        ]
+        for process in running:
+            process.terminate()
+        deadline = self.clock() + timeout
+        for process in running:
+            try:
+                process.wait(max(0, deadline - self.clock()))
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        logging.info(WORKERS_STOPPED)
+
+    def run(self):
+        """Наблюдение за процессами до сигнала остановки."""
+        with shutdown.Shutdown() as stopper:
+            while self.alive() and not stopper.requested.is_set():
+                for worker in self.workers:
+                    self.check(worker)
+                with stopper.interruptible():
+                    time.sleep(SUPERVISOR_PERIOD)
+        self.stop()
+
+
+def parse_args(argv=None):
+    """Параметры командной строки."""
+    parser = argparse.ArgumentParser(
+        description='Опрос подписок несколькими процессами engine.py'
+    )
+    parser.add_argument('--workers', type=int, default=ENGINE_WORKERS,
+                        help='число процессов')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Запуск процессов и наблюдение за ними."""
+    homework.require_tokens(('TELEGRAM_TOKEN',))
+    Supervisor(parse_args(argv).workers).run()
+
+
+if __name__ == '__main__':
+    homework.configure_logging()
+    main()
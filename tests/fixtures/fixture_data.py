@@ -4,6 +4,8 @@ from datetime import datetime
 
 import pytest
 
+from utils import Clock
+
 
 @pytest.fixture
 def random_timestamp():
@@ -12,6 +14,11 @@ def random_timestamp():
     return random.randint(left_ts, right_ts)
 
 
+@pytest.fixture
+def clock():
+    return Clock()
+
+
 @pytest.fixture
 def current_timestamp():
     return int(datetime.now().timestamp())
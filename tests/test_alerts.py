@@ -0,0 +1,102 @@
+import json
+
+from alerts import Alerts
+import homework
+from utils import Clock
+
+
+def api_error(headers, from_date):
+    return ConnectionError(homework.ERROR_API.format(
+        error='timeout', url=homework.ENDPOINT, headers=headers,
+        params={'from_date': from_date}
+    ))
+
+
+class TestAlerts:
+
+    def test_fingerprint_ignores_volatile_fields(self):
+        alerts = Alerts(homework.ERROR_TEMPLATES)
+        assert alerts.fingerprint(api_error({'a': 1}, 1)) == (
+            alerts.fingerprint(api_error({'b': 2}, 2))
+        ), 'Отпечаток не должен зависеть от заголовков и параметров.'
+        assert alerts.fingerprint(api_error({}, 1)) != alerts.fingerprint(
+            RuntimeError(api_error({}, 1))
+        ), 'Отпечаток должен учитывать тип исключения.'
+        assert alerts.fingerprint(ValueError('bad 123')) == (
+            alerts.fingerprint(ValueError('bad 456'))
+        )
+
+    def test_alternating_errors_notified_once(self):
+        clock = Clock()
+        alerts = Alerts(homework.ERROR_TEMPLATES, ttl=600, clock=clock)
+        notified = []
+        for cycle in range(6):
+            clock.now = cycle * 60
+            error = api_error({}, cycle) if cycle % 2 else KeyError('x')
+            if alerts.due(error):
+                alerts.sent(error)
+                notified.append(error)
+        assert len(notified) == 2, (
+            'Чередующиеся ошибки должны отправляться по одному разу.'
+        )
+        clock.now = 600
+        assert alerts.due(KeyError('x')), (
+            'Повтор ошибки должен отправляться по истечении ALERT_TTL.'
+        )
+
+    def test_unsent_error_stays_due(self):
+        alerts = Alerts(clock=Clock())
+        error = RuntimeError('сбой')
+        assert alerts.due(error)
+        assert alerts.due(error), (
+            'Неотправленное сообщение об ошибке нужно повторить.'
+        )
+
+    def test_lru_size(self):
+        alerts = Alerts(size=2, clock=Clock())
+        for name in ('a', 'b', 'c'):
+            error = KeyError(name)
+            alerts.due(error)
+            alerts.sent(error)
+        assert len(alerts) == 2
+        assert alerts.due(KeyError('a'))
+        assert not alerts.due(KeyError('c'))
+
+    def test_state(self):
+        alerts = Alerts(homework.ERROR_TEMPLATES, clock=Clock())
+        error = api_error({}, 1)
+        alerts.due(error)
+        alerts.sent(error)
+        restored = Alerts(homework.ERROR_TEMPLATES, clock=Clock())
+        restored.restore(json.loads(json.dumps(alerts.to_list())))
+        assert not restored.due(api_error({}, 2))
+        assert restored.resolve() == 1
+        assert len(restored) == 0
+
+
+class TestTrackerAlerts:
+
+    def test_resolved_message(self, current_timestamp):
+        responses = [
+            RuntimeError('сбой 1'), KeyError('x'), RuntimeError('сбой 2'),
+            {'homeworks': [], 'current_date': current_timestamp}
+        ]
+        sent = []
+
+        def fetch(from_date):
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        tracker = homework.Tracker(fetch, sent.append)
+        for _ in range(4):
+            tracker.poll()
+        assert sent[:2] == [
+            homework.FAILURE.format(error=RuntimeError('сбой 1')),
+            homework.FAILURE.format(error=KeyError('x'))
+        ]
+        assert sent[2:] == [homework.RESOLVED.format(count=2)], (
+            'После прекращения ошибок должно отправляться сообщение '
+            'о восстановлении.'
+        )
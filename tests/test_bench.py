@@ -0,0 +1,36 @@
+import json
+
+import bench
+import homework
+
+
+class TestBench:
+
+    def test_report_and_compare(self, tmp_path, capsys):
+        output = tmp_path / 'bench.json'
+        endpoint = homework.ENDPOINT
+        report = bench.main([
+            '--sizes', '1', '10', '--tenants', '2', '--repeat', '2',
+            '--output', str(output)
+        ])
+        assert homework.ENDPOINT == endpoint, (
+            'После замеров настройки модуля должны восстанавливаться.'
+        )
+        stages = [(result['name'], result['size'])
+                  for result in report['results']]
+        assert stages == [
+            ('fetch', 1), ('check', 1), ('parse', 1),
+            ('fetch', 10), ('check', 10), ('parse', 10),
+            ('send', 1), ('tenants', 2)
+        ]
+        for result in report['results']:
+            assert result['p50_ms'] <= result['p99_ms']
+            assert result['throughput'] > 0
+        assert json.loads(output.read_text()) == report
+        assert len(bench.compare(report, report)) == len(stages)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        assert bench.percentile(values, 0.5) in (50, 51)
+        assert bench.percentile(values, 0.99) == 99
+        assert bench.percentile([5], 0.99) == 5
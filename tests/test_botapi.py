@@ -0,0 +1,75 @@
+import pytest
+
+import botapi
+from fake_api import FakeServer
+from ratelimit import RateLimiter
+
+
+@pytest.fixture
+def server():
+    with FakeServer() as server:
+        yield server
+
+
+@pytest.fixture
+def bot(server):
+    return botapi.BotClient('1234:native', server.telegram_url, timeout=2)
+
+
+class TestBotClient:
+
+    def test_send_message(self, server, bot):
+        message = bot.send_message('42', 'Привет')
+        assert message.chat_id == 42
+        assert message.text == 'Привет'
+        assert server.messages == [('42', 'Привет')], (
+            'Сообщение должно уйти методом sendMessage.'
+        )
+        assert bot.get_me().username == 'fake_bot'
+
+    def test_get_updates(self, server, bot):
+        server.push_update('42', '/status')
+        updates = bot.get_updates(offset=0, timeout=0)
+        assert [(update.message.chat_id, update.message.text)
+                for update in updates] == [(42, '/status')]
+        assert bot.get_updates(offset=updates[-1].update_id + 1) == []
+
+    @pytest.mark.parametrize('status, error', (
+        (401, botapi.Unauthorized),
+        (400, botapi.BadRequest),
+        (502, botapi.NetworkError),
+    ))
+    def test_errors(self, server, bot, status, error):
+        server.faults.error_rate = 1
+        server.faults.error_status = status
+        with pytest.raises(error):
+            bot.send_message('42', 'Привет')
+
+    def test_retry_after(self, server, bot):
+        server.faults.error_rate = 1
+        server.faults.error_status = 429
+        server.faults.retry_after = 3
+        with pytest.raises(botapi.RetryAfter) as error:
+            bot.send_message('42', 'Привет')
+        assert error.value.retry_after == 3
+
+    def test_unavailable(self):
+        bot = botapi.BotClient('1234:native', 'http://127.0.0.1:9/bot',
+                               timeout=1)
+        with pytest.raises(botapi.NetworkError) as error:
+            bot.send_message('42', 'Привет')
+        assert '1234:native' not in str(error.value), (
+            'Текст ошибки не должен содержать токен бота.'
+        )
+
+    def test_rate_limiter_retries(self, server, bot):
+        server.faults.error_rate = 1
+        server.faults.error_status = 429
+        server.faults.retry_after = 0
+        pauses = []
+        limiter = RateLimiter(retry_limit=2, sleep=pauses.append)
+        with pytest.raises(botapi.errors('RetryAfter')):
+            limiter.send(bot, '42', 'Привет')
+        assert server.requests == 3, (
+            'Ограничитель должен повторять отправку после RetryAfter.'
+        )
@@ -0,0 +1,127 @@
+from email.utils import formatdate
+
+import pytest
+
+import breaker
+from breaker import CircuitBreaker, CircuitOpen, UpstreamError
+from cache import ResponseCache
+import engine
+from fake_api import FakeServer
+import homework
+from scheduler import Scheduler
+from utils import Clock
+
+
+def fail(retry_after=None):
+    raise UpstreamError('503', retry_after)
+
+
+class TestRetryAfter:
+
+    @pytest.mark.parametrize('value, expected', (
+        ('7', 7.0), (' 120 ', 120.0), ('-5', 0.0), (None, None),
+        ('soon', None), ('999999', breaker.RETRY_AFTER_MAX)
+    ))
+    def test_seconds(self, value, expected):
+        assert breaker.parse_retry_after(value) == expected
+
+    def test_http_date(self):
+        value = formatdate(1000030, usegmt=True)
+        assert breaker.parse_retry_after(value, now=lambda: 1000000) == 30, (
+            'Retry-After в виде HTTP-даты должен давать паузу до неё.'
+        )
+
+    def test_read_response(self):
+        params = {'url': 'url', 'headers': {}, 'params': {}}
+        with pytest.raises(UpstreamError) as error:
+            homework.read_response(429, dict, params, '12')
+        assert error.value.retry_after == 12
+        with pytest.raises(UpstreamError) as error:
+            homework.read_response(500, dict, params, '12')
+        assert error.value.retry_after is None
+        with pytest.raises(RuntimeError) as error:
+            homework.read_response(401, dict, params)
+        assert not isinstance(error.value, UpstreamError), (
+            'Ошибка авторизации не должна считаться сбоем API.'
+        )
+
+    def test_scheduler_honours_retry_after(self):
+        scheduler = Scheduler(idle=600, active=120, minimum=60, maximum=3600)
+        scheduler.failure(retry_after=2000)
+        assert 2000 <= scheduler.next_delay() <= 3600
+        scheduler.failure(retry_after=10 ** 6)
+        assert scheduler.next_delay() == 3600
+        scheduler.success()
+        assert scheduler.next_delay() == 600
+
+
+class TestCircuitBreaker:
+
+    def test_opens_after_threshold(self):
+        clock = Clock()
+        circuit = CircuitBreaker('api', threshold=3, reset=60, clock=clock)
+        for _ in range(3):
+            with pytest.raises(UpstreamError):
+                circuit.call(fail)
+        assert circuit.state == breaker.OPEN
+        calls = []
+        with pytest.raises(CircuitOpen) as error:
+            circuit.call(calls.append, 1)
+        assert calls == [], 'Разомкнутый автомат не должен пропускать запрос.'
+        assert error.value.retry_after == 60
+
+    def test_half_open_probe(self):
+        clock = Clock()
+        circuit = CircuitBreaker('api', threshold=1, reset=60, clock=clock)
+        with pytest.raises(UpstreamError):
+            circuit.call(fail)
+        clock.now = 60
+        circuit.before()
+        assert circuit.state == breaker.HALF_OPEN
+        with pytest.raises(CircuitOpen):
+            circuit.before()
+        circuit.failure()
+        assert circuit.state == breaker.OPEN, (
+            'Неудачный пробный запрос должен снова разомкнуть автомат.'
+        )
+        clock.now = 120
+        assert circuit.call(lambda: 'ok') == 'ok'
+        assert circuit.state == breaker.CLOSED
+
+    def test_retry_after_opens_immediately(self):
+        clock = Clock()
+        circuit = CircuitBreaker('api', threshold=5, reset=60, clock=clock)
+        with pytest.raises(UpstreamError):
+            circuit.call(fail, 15)
+        with pytest.raises(CircuitOpen):
+            circuit.before()
+        clock.now = 15
+        circuit.before()
+
+    def test_tenant_errors_do_not_count(self):
+        circuit = CircuitBreaker('api', threshold=1, clock=Clock())
+
+        def unauthorized():
+            raise RuntimeError('401')
+
+        with pytest.raises(RuntimeError):
+            circuit.call(unauthorized)
+        assert circuit.state == breaker.CLOSED
+
+    def test_shared_across_tenants(self, monkeypatch, current_timestamp):
+        with FakeServer(homeworks=1, seed=1) as server:
+            monkeypatch.setattr(homework, 'ENDPOINT', server.endpoint)
+            server.faults.error_rate = 1
+            server.faults.error_status = 429
+            server.faults.retry_after = 30
+            cache = ResponseCache(ttl=30, size=10)
+            with pytest.raises(UpstreamError):
+                engine.cached_statuses(cache, 'token1', current_timestamp)
+            with pytest.raises(CircuitOpen):
+                engine.cached_statuses(cache, 'token2', current_timestamp)
+            assert server.requests == 1, (
+                'После 429 API не должен опрашиваться и для других подписок.'
+            )
+            assert breaker.for_endpoint(server.endpoint) is (
+                breaker.for_endpoint(server.endpoint)
+            )
@@ -0,0 +1,79 @@
+import threading
+
+import pytest
+
+from cache import ResponseCache
+from utils import Clock
+
+
+class TestResponseCache:
+
+    def test_ttl(self):
+        clock = Clock()
+        cache = ResponseCache(ttl=30, size=10, clock=clock)
+        loads = []
+
+        def load():
+            loads.append(clock.now)
+            return {'homeworks': [], 'current_date': len(loads)}
+
+        assert cache.get(('token', 1), load)['current_date'] == 1
+        clock.now = 29
+        assert cache.get(('token', 1), load)['current_date'] == 1
+        clock.now = 30
+        assert cache.get(('token', 1), load)['current_date'] == 2, (
+            'Просроченный ответ должен запрашиваться заново.'
+        )
+        assert cache.get(('other', 1), load)['current_date'] == 3
+
+    def test_eviction(self):
+        cache = ResponseCache(ttl=30, size=2, clock=Clock())
+        for key in 'abc':
+            cache.get(key, lambda key=key: {'key': key})
+        assert len(cache) == 2
+        assert cache.get('a', lambda: {'key': 'new'}) == {'key': 'new'}
+
+    def test_errors_are_not_cached(self):
+        cache = ResponseCache(ttl=30, size=2, clock=Clock())
+
+        def fail():
+            raise ConnectionError('API недоступен')
+
+        with pytest.raises(ConnectionError):
+            cache.get('key', fail)
+        assert cache.get('key', lambda: {'ok': True}) == {'ok': True}
+
+    def test_single_flight(self):
+        cache = ResponseCache(ttl=30, size=10)
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow_load():
+            calls.append(1)
+            started.set()
+            release.wait(1)
+            return {'homeworks': []}
+
+        results = []
+        leader = threading.Thread(
+            target=lambda: results.append(cache.get('key', slow_load))
+        )
+        leader.start()
+        started.wait(1)
+        followers = [
+            threading.Thread(
+                target=lambda: results.append(cache.get('key', slow_load))
+            )
+            for _ in range(5)
+        ]
+        for thread in followers:
+            thread.start()
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(1)
+        assert len(calls) == 1, (
+            'Одновременные запросы с одним ключом должны объединяться.'
+        )
+        assert len(results) == 6
+        assert all(result is results[0] for result in results)
@@ -0,0 +1,49 @@
+import os
+
+import checkpoint
+import homework
+
+
+class TestCheckpoint:
+
+    def test_save_and_load(self, tmp_path):
+        path = tmp_path / 'state.json'
+        state = {'current_date': 123, 'statuses': {'1': 'approved'}}
+        checkpoint.save(path, state)
+        assert checkpoint.load(path) == state
+        assert os.listdir(tmp_path) == ['state.json'], (
+            'Убедитесь, что временный файл не остаётся после записи.'
+        )
+
+    def test_load_missing_or_broken(self, tmp_path):
+        assert checkpoint.load(tmp_path / 'missing.json') == {}
+        broken = tmp_path / 'broken.json'
+        broken.write_text('{"current_date": ')
+        assert checkpoint.load(broken) == {}
+
+    def test_tracker_resumes_from_checkpoint(self, tmp_path,
+                                             random_timestamp):
+        path = tmp_path / 'state.json'
+        checkpoint.save(path, {
+            'current_date': random_timestamp,
+            'statuses': {'hw123': 'reviewing'},
+            'old_message': 'error'
+        })
+        requested = []
+
+        def fetch(from_date):
+            requested.append(from_date)
+            return {'homeworks': [], 'current_date': random_timestamp + 1}
+
+        tracker = homework.Tracker(fetch, lambda message: None, path)
+        assert tracker.scheduler.in_flight == {'hw123'}
+        tracker.poll()
+        assert requested == [random_timestamp], (
+            'После перезапуска опрос должен продолжаться с `current_date` '
+            'из контрольной точки.'
+        )
+        state = checkpoint.load(path)
+        assert state['current_date'] == random_timestamp + 1
+        assert 'old_message' not in state, (
+            'Повторы ошибок учитывает Alerts, old_message не сохраняется.'
+        )
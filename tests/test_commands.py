@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+
+import commands
+import homework
+
+
+def make_update(update_id, chat_id, text):
+    return SimpleNamespace(
+        update_id=update_id,
+        message=SimpleNamespace(chat_id=chat_id, text=text)
+    )
+
+
+class UpdatesBot:
+    def __init__(self, updates):
+        self.updates = updates
+        self.offsets = []
+
+    def get_updates(self, offset=None, **kwargs):
+        self.offsets.append(offset)
+        updates, self.updates = self.updates, []
+        return updates
+
+
+def make_tracker(homeworks):
+    fetched = []
+
+    def fetch(from_date):
+        fetched.append(from_date)
+        return {'homeworks': homeworks, 'current_date': from_date}
+
+    return homework.Tracker(fetch, lambda message: None), fetched
+
+
+class TestCommands:
+
+    def test_status_and_history_from_cache(self):
+        homeworks = [
+            {'id': 1, 'homework_name': 'hw1', 'status': 'reviewing',
+             'date_updated': '2024-03-01T10:00:00Z'},
+            {'id': 2, 'homework_name': 'hw2', 'status': 'approved',
+             'date_updated': '2024-03-02T10:00:00Z'},
+        ]
+        tracker, fetched = make_tracker(homeworks)
+        tracker.poll()
+        homeworks[:] = [
+            {'id': 1, 'homework_name': 'hw1', 'status': 'rejected',
+             'date_updated': '2024-03-03T10:00:00Z'}
+        ]
+        tracker.poll()
+        requests_before = len(fetched)
+        sent = []
+        bot = UpdatesBot([
+            make_update(7, 100, '/status'),
+            make_update(8, 100, '/history@some_bot'),
+            make_update(9, 100, 'просто текст'),
+            make_update(10, 200, '/status'),
+        ])
+        server = commands.CommandServer(
+            bot, {100: [tracker]}, lambda chat, text: sent.append((chat, text))
+        )
+        server.poll()
+        server.poll()
+        assert bot.offsets == [None, 11], (
+            'Убедитесь, что обработанные обновления подтверждаются offset.'
+        )
+        assert len(fetched) == requests_before, (
+            'Команды не должны вызывать запросы к API.'
+        )
+        status, history, unknown = sent
+        assert 'hw2' in status[1] and 'замечания' in status[1]
+        assert 'взята на проверку' not in status[1], (
+            'Команда /status должна показывать только последний статус.'
+        )
+        assert history[1].count('\n') == 2
+        assert history[1].startswith('2024-03-01T10:00:00Z')
+        assert unknown == (200, commands.UNKNOWN_CHAT)
+
+    def test_status_of_every_homework(self):
+        homeworks = [
+            {'id': number, 'homework_name': f'hw{number}',
+             'status': 'approved',
+             'date_updated': f'2024-03-01T10:00:{number:02}Z'}
+            for number in range(homework.HISTORY_SIZE + 5)
+        ]
+        tracker, _ = make_tracker(homeworks)
+        tracker.poll()
+        text = commands.status_text([tracker])
+        assert text.count('\n') == len(homeworks) - 1, (
+            'Команда /status должна показывать все работы, а не только '
+            'попавшие в историю изменений.'
+        )
+        assert '"hw0"' in text
+
+    def test_empty_cache(self):
+        tracker, _ = make_tracker([])
+        assert commands.status_text([tracker]) == commands.NO_STATUSES
+        assert commands.history_text([tracker]) == commands.NO_STATUSES
@@ -0,0 +1,106 @@
+from functools import partial
+import time
+
+import pytest
+
+import botapi
+import deadline
+import homework
+import metrics
+from ratelimit import RateLimiter
+from utils import Clock
+
+
+def overruns(stage):
+    return metrics.DEADLINE_OVERRUNS.values.get((('stage', stage),), 0)
+
+
+class TestDeadline:
+
+    def test_timeouts_outside_cycle(self):
+        assert deadline.current() is None
+        assert deadline.api_timeout() == (
+            deadline.API_CONNECT_TIMEOUT, deadline.API_READ_TIMEOUT
+        )
+        assert deadline.send_timeout() == deadline.SEND_TIMEOUT
+
+    def test_timeouts_limited_by_budget(self):
+        clock = Clock()
+        with deadline.cycle(budget=60, clock=clock) as budget:
+            assert deadline.current() is budget
+            assert deadline.api_timeout() == (
+                min(deadline.API_CONNECT_TIMEOUT, 60),
+                min(deadline.API_READ_TIMEOUT, 60)
+            )
+            clock.now = 58
+            assert deadline.api_timeout() == (2, 2), (
+                'Таймауты не должны выходить за остаток бюджета цикла.'
+            )
+            assert deadline.send_timeout() == 2
+        assert deadline.current() is None
+
+    def test_budget_spent(self):
+        clock = Clock()
+        before = {stage: overruns(stage) for stage in ('api', 'cycle')}
+        with deadline.cycle(budget=5, clock=clock):
+            clock.now = 5
+            with pytest.raises(deadline.DeadlineExceeded):
+                deadline.api_timeout()
+        assert overruns('api') == before['api'] + 1
+        assert overruns('cycle') == before['cycle'] + 1, (
+            'Цикл, не уложившийся в бюджет, должен учитываться в метриках.'
+        )
+
+    def test_request_uses_timeouts(self, monkeypatch, current_timestamp):
+        calls = []
+
+        class Response:
+            status_code = 200
+
+            def json(self):
+                return {'homeworks': [], 'current_date': current_timestamp}
+
+        def mock_get(**kwargs):
+            calls.append(kwargs)
+            return Response()
+
+        monkeypatch.setattr(homework.requests, 'get', mock_get)
+        homework.get_api_answer(current_timestamp)
+        assert calls[0]['timeout'] == deadline.api_timeout(), (
+            'Запрос к API должен выполняться с таймаутами.'
+        )
+
+    def test_send_uses_timeout(self):
+        class Bot:
+            def send_message(self, chat_id, text, timeout=None):
+                self.timeout = timeout
+
+        bot = Bot()
+        limiter = RateLimiter(global_rate=100, global_burst=100,
+                              chat_rate=100, chat_burst=100)
+        with deadline.cycle(budget=3):
+            limiter.send(bot, 1, 'текст')
+        assert 0 < bot.timeout <= 3, (
+            'Отправка должна ограничиваться остатком бюджета цикла.'
+        )
+
+    def test_send_after_budget_spent(self, monkeypatch):
+        class Bot:
+            def send_message(self, chat_id, text, timeout=None):
+                raise AssertionError('Бюджет цикла уже исчерпан.')
+
+        monkeypatch.setattr(
+            deadline, 'cycle', partial(deadline.cycle, budget=0.05)
+        )
+
+        def fetch(from_date):
+            time.sleep(0.1)
+            raise ConnectionError('API не ответил')
+
+        tracker = homework.Tracker(
+            fetch, partial(homework.send_to_chat, Bot(), 1)
+        )
+        tracker.poll()
+        with deadline.cycle(budget=0):
+            with pytest.raises(botapi.errors('TelegramError')):
+                homework.send_to_chat(Bot(), 1, 'текст')
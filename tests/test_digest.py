@@ -0,0 +1,189 @@
+from functools import partial
+import inspect
+import time
+
+import pytest
+
+import botapi
+from digest import Digest, MESSAGE_LIMIT, split_messages
+import homework
+import outbox
+from outbox import Outbox
+import shutdown
+
+
+class TestDigest:
+
+    def test_window(self, clock):
+        sent = []
+        digest = Digest(lambda *args: sent.append(args), window=60,
+                        clock=clock)
+        for name in ('a.zip', 'b.zip', 'c.zip'):
+            digest.add(1, homework.CHANGE_STATUS.format(
+                homework_name=name, verdict=homework.HOMEWORK_VERDICTS[
+                    'approved'
+                ]
+            ))
+        digest.add(2, 'другой чат')
+        assert digest.flush() == 0, 'Сводка не должна уходить до конца окна.'
+        clock.now = 60
+        assert digest.flush() == 2
+        assert len(sent) == 2
+        chat_id, text = sent[0]
+        assert chat_id == 1 and text.count('\n') == 2, (
+            'Все изменения чата за окно должны уйти одним сообщением.'
+        )
+        assert len(digest) == 0
+
+    def test_split_at_limit(self):
+        messages = [('x' * 3000, 1), ('y' * 3000, 2), ('z' * 10000, 3)]
+        groups = list(split_messages(messages))
+        texts = ['\n'.join(part for part, _ in group) for group in groups]
+        assert all(len(text) <= MESSAGE_LIMIT for text in texts), (
+            'Сообщение сводки не должно превышать лимит Telegram.'
+        )
+        assert texts[0] == 'x' * 3000
+        assert ''.join(texts[2:]) == 'z' * 10000
+        assert [key for group in groups for _, key in group] == [
+            1, 2, None, None, 3
+        ], 'Ключ должен оставаться только у последней части сообщения.'
+        assert len(list(split_messages([('a', 1), ('b', 2)], limit=3))) == 1
+
+    def test_failed_part_kept(self, clock):
+        sent = []
+        failures = [RuntimeError('сбой')]
+
+        def send(chat_id, text):
+            if len(sent) == 1 and failures:
+                raise failures.pop()
+            sent.append(text)
+
+        digest = Digest(send, window=10, limit=5, retry_period=30,
+                        clock=clock)
+        for message in ('aaaa', 'bbbb', 'cccc'):
+            digest.add(1, message)
+        digest.add(2, 'dd')
+        clock.now = 10
+        digest.flush()
+        assert sent == ['aaaa', 'dd']
+        assert len(digest) == 2, (
+            'Неотправленная часть сводки должна остаться для повтора.'
+        )
+        clock.now = 40
+        digest.flush()
+        assert sent == ['aaaa', 'dd', 'bbbb', 'cccc']
+
+    def test_failed_chat_backs_off(self, clock):
+        attempts = []
+        errors = [botapi.Unauthorized('бот заблокирован')] * 6 + [
+            botapi.RetryAfter(500)
+        ]
+
+        def send(chat_id, text):
+            attempts.append(clock.now)
+            if errors:
+                raise errors.pop(0)
+
+        digest = Digest(send, window=10, retry_period=10, retry_max=60,
+                        clock=clock)
+        digest.add(1, 'текст')
+        for second in range(10, 301):
+            clock.now = second
+            digest.flush()
+        assert attempts == [10, 20, 40, 80, 140, 200, 260], (
+            'Повторы неотправленной сводки должны откладываться с растущей '
+            'паузой.'
+        )
+        clock.now = 700
+        digest.flush()
+        assert len(attempts) == 7, 'Пауза из RetryAfter должна соблюдаться.'
+        clock.now = 760
+        digest.flush()
+        assert len(attempts) == 8 and len(digest) == 0
+
+    def test_force(self, clock):
+        sent = []
+        digest = Digest(lambda *args: sent.append(args), window=600,
+                        clock=clock)
+        digest.add(1, 'текст')
+        digest.flush(force=True)
+        assert sent == [(1, 'текст')], (
+            'При остановке сводка должна отправляться без ожидания окна.'
+        )
+
+    def test_outbox_keeps_digest_until_sent(self, tmp_path, clock):
+        path = tmp_path / 'outbox.db'
+        journal = Outbox(path, None, clock=clock)
+        digest = Digest(None, journal.confirm, window=60, clock=clock)
+        journal.dispatch = digest.add
+        journal.submit(1, 'первое')
+        journal.submit(1, 'второе')
+        journal.close()
+        assert len(digest) == 2
+
+        sent = []
+        journal = Outbox(path, None, clock=clock)
+        digest = Digest(lambda *args: sent.append(args), journal.confirm,
+                        window=60, clock=clock)
+        journal.dispatch = digest.add
+        clock.now = 3600
+        journal.retry()
+        journal.retry()
+        assert len(digest) == 2, (
+            'Повторная передача из журнала не должна дублировать сводку.'
+        )
+        clock.now = 3660
+        digest.flush()
+        assert sent == [('1', 'первое\nвторое')], (
+            'Накопленная сводка должна пережить перезапуск через журнал '
+            'исходящих.'
+        )
+        assert journal.pending() == 0
+
+    def test_digest_requires_outbox(self, monkeypatch):
+        monkeypatch.setattr(homework, 'DIGEST_PERIOD', 60)
+        assert homework.start_digest(None, None) is None
+
+    def test_main_sends_digest_between_polls(self, monkeypatch, tmp_path,
+                                             current_timestamp):
+        sent = []
+
+        class Bot:
+            def __init__(self, **kwargs):
+                pass
+
+            def send_message(self, chat_id, text, timeout=None):
+                sent.append(text)
+
+        real_sleep = time.sleep
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(sent[:])
+            started = time.monotonic()
+            while not sent and time.monotonic() - started < 1:
+                real_sleep(0.01)
+            sleeps.append(sent[:])
+            raise shutdown.Stop
+
+        for name in homework.TOKENS:
+            monkeypatch.setattr(homework, name, '1')
+        monkeypatch.setattr(homework, 'DIGEST_PERIOD', 0.05)
+        monkeypatch.setattr(outbox, 'OUTBOX_FILE', str(tmp_path / 'out.db'))
+        monkeypatch.setattr(
+            homework, 'Digest', partial(Digest, window=0.05, period=0.01)
+        )
+        monkeypatch.setattr(homework.telegram, 'Bot', Bot)
+        monkeypatch.setattr(homework, 'get_api_answer', lambda time: {
+            'homeworks': [{'id': 1, 'homework_name': 'hw.zip',
+                           'status': 'approved'}],
+            'current_date': current_timestamp
+        })
+        monkeypatch.setattr(time, 'sleep', sleep)
+        # tests/test_bot.py оборачивает main() проверкой вызова time.sleep.
+        inspect.unwrap(homework.main)()
+        assert sleeps[0] == [] and len(sleeps[1]) == 1, (
+            'Сводка должна уходить по окончании окна, не дожидаясь '
+            'следующего опроса.'
+        )
+        assert len(sent) == 1
@@ -0,0 +1,59 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+import engine
+
+
+class TestEngine:
+
+    def test_load_subscriptions(self, tmp_path):
+        path = tmp_path / 'subscriptions.json'
+        path.write_text(json.dumps([
+            {'practicum_token': 'token1', 'chat_id': 1},
+            {'name': 'student', 'practicum_token': 'token2', 'chat_id': '2'}
+        ]))
+        subscriptions = engine.load_subscriptions(path)
+        assert subscriptions == [
+            engine.Subscription('1', 'token1', '1'),
+            engine.Subscription('student', 'token2', '2')
+        ], 'Проверьте чтение подписок из файла.'
+
+    @pytest.mark.parametrize('items', ([], {}, [{'chat_id': 1}]))
+    def test_load_invalid_subscriptions(self, tmp_path, items):
+        path = tmp_path / 'subscriptions.json'
+        path.write_text(json.dumps(items))
+        with pytest.raises((KeyError, ValueError)):
+            engine.load_subscriptions(path)
+
+    def test_run_limits_concurrency(self, monkeypatch):
+        lock = threading.Lock()
+        stats = {'active': 0, 'peak': 0, 'calls': 0}
+
+        class SlowTracker:
+            def poll(self):
+                with lock:
+                    stats['active'] += 1
+                    stats['calls'] += 1
+                    stats['peak'] = max(stats['peak'], stats['active'])
+                time.sleep(0.05)
+                with lock:
+                    stats['active'] -= 1
+                return 600
+
+        async def run_once():
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    engine.run([SlowTracker() for _ in range(8)], 3), 0.5
+                )
+
+        asyncio.run(run_once())
+        assert stats['calls'] == 8, (
+            'Убедитесь, что опрашиваются все подписки.'
+        )
+        assert stats['peak'] <= 3, (
+            'Убедитесь, что число одновременных запросов ограничено.'
+        )
@@ -0,0 +1,64 @@
+import time
+
+import pytest
+import requests
+import telegram
+
+import homework
+from fake_api import FakeServer
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with FakeServer(homeworks=3, seed=1) as server:
+        monkeypatch.setattr(homework, 'ENDPOINT', server.endpoint)
+        yield server
+
+
+class TestFakeApi:
+
+    def test_homework_statuses(self, server, current_timestamp):
+        response = homework.get_api_answer(current_timestamp)
+        homework.check_response(response)
+        assert len(response['homeworks']) == 3
+        for item in response['homeworks']:
+            assert homework.parse_status(item).startswith(
+                'Изменился статус проверки работы'
+            )
+        assert server.requests == 1
+
+    @pytest.mark.parametrize('payload_error', ('code', 'error'))
+    def test_payload_errors(self, server, current_timestamp, payload_error):
+        server.faults.payload_error = payload_error
+        with pytest.raises(RuntimeError):
+            homework.get_api_answer(current_timestamp)
+
+    def test_error_status(self, server, current_timestamp):
+        server.faults.error_rate = 1
+        server.faults.error_status = 503
+        server.faults.retry_after = 7
+        response = requests.get(server.endpoint)
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '7'
+        with pytest.raises(RuntimeError):
+            homework.get_api_answer(current_timestamp)
+
+    def test_latency(self, server, current_timestamp):
+        server.faults.latency = 0.2
+        started = time.monotonic()
+        homework.get_api_answer(current_timestamp)
+        assert time.monotonic() - started >= 0.2
+
+    def test_telegram(self, server):
+        bot = telegram.Bot('123:abc', base_url=server.telegram_url)
+        assert bot.get_me().username == 'fake_bot'
+        bot.send_message(42, 'Текст')
+        assert server.messages == [('42', 'Текст')]
+        server.push_update(42, '/status')
+        updates = bot.get_updates(timeout=0)
+        assert updates[0].message.text == '/status'
+        server.faults.error_rate = 1
+        server.faults.error_status = 429
+        server.faults.retry_after = 3
+        with pytest.raises(telegram.error.RetryAfter):
+            bot.send_message(42, 'Текст')
@@ -0,0 +1,73 @@
+import json
+import logging
+import queue
+import sys
+
+import logs
+from utils import Clock
+
+
+def make_record(message, level=logging.ERROR):
+    return logging.makeLogRecord({
+        'msg': message, 'levelno': level,
+        'levelname': logging.getLevelName(level)
+    })
+
+
+class TestRepeatFilter:
+
+    def test_repeats_suppressed(self):
+        clock = Clock()
+        repeats = logs.RepeatFilter(limit=2, window=60, clock=clock)
+        passed = [
+            repeats.filter(make_record('Сбой')) for _ in range(5)
+        ]
+        assert passed == [True, True, False, False, False], (
+            'Одинаковые ошибки сверх лимита должны отбрасываться.'
+        )
+        assert repeats.filter(make_record('Другой сбой'))
+        assert repeats.filter(make_record('Сбой', logging.DEBUG))
+        clock.now = 60
+        record = make_record('Сбой')
+        assert repeats.filter(record)
+        assert 'ещё 3' in record.getMessage(), (
+            'После окна нужно сообщить число пропущенных записей.'
+        )
+
+
+class TestQueueHandler:
+
+    def test_record_prepared(self):
+        handler = logs.NonBlockingQueueHandler(queue.Queue())
+        handler.addFilter(logs.CycleFilter())
+        logs.new_cycle()
+        try:
+            raise ValueError('ошибка')
+        except ValueError:
+            record = logging.makeLogRecord({
+                'msg': 'Работа %s', 'args': ('1',), 'levelno': logging.ERROR,
+                'levelname': 'ERROR', 'exc_info': sys.exc_info()
+            })
+        handler.handle(record)
+        queued = handler.queue.get_nowait()
+        assert queued.getMessage() == 'Работа 1'
+        assert queued.exc_info is None
+        assert 'ValueError' in queued.exc_text
+        data = json.loads(logs.JsonFormatter().format(queued))
+        assert data['cycle'] == logs.cycle_id.get(), (
+            'Запись должна содержать идентификатор цикла опроса.'
+        )
+        assert 'ValueError' in data['exc']
+
+    def test_full_queue_does_not_block(self):
+        handler = logs.NonBlockingQueueHandler(queue.Queue(maxsize=2))
+        for number in range(4):
+            handler.handle(make_record(f'Запись {number}', logging.INFO))
+        assert handler.dropped == 2, (
+            'При переполнении очереди записи должны отбрасываться.'
+        )
+        handler.queue.get_nowait()
+        handler.queue.get_nowait()
+        handler.handle(make_record('Запись 4', logging.INFO))
+        assert 'пропущено записей: 2' in handler.queue.get_nowait().msg
+        assert handler.queue.get_nowait().msg == 'Запись 4'
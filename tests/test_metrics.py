@@ -0,0 +1,84 @@
+from functools import partial
+
+import requests
+
+import botapi
+import homework
+import metrics
+from sender import SendQueue
+
+
+class TestMetrics:
+
+    def test_histogram(self):
+        histogram = metrics.Histogram('test_seconds', 'Тест',
+                                      buckets=(0.1, 1))
+        histogram.observe(0.05, stage='api')
+        histogram.observe(0.5, stage='api')
+        histogram.observe(5, stage='api')
+        lines = histogram.render()
+        assert '# TYPE test_seconds histogram' in lines
+        assert 'test_seconds_bucket{stage="api",le="0.1"} 1' in lines
+        assert 'test_seconds_bucket{stage="api",le="1"} 2' in lines
+        assert 'test_seconds_bucket{stage="api",le="+Inf"} 3' in lines
+        assert 'test_seconds_count{stage="api"} 3' in lines
+        assert 'test_seconds_sum{stage="api"} 5.55' in lines
+
+    def test_counter_and_gauge(self):
+        counter = metrics.Counter('test_total', 'Тест')
+        counter.inc(type='ConnectionError')
+        counter.inc(type='ConnectionError')
+        assert 'test_total{type="ConnectionError"} 2' in counter.render()
+        gauge = metrics.Gauge('test_depth', 'Тест')
+        depth = [3]
+        gauge.set_function(lambda: depth[0], queue='send')
+        assert 'test_depth{queue="send"} 3' in gauge.render()
+        depth[0] = 5
+        assert 'test_depth{queue="send"} 5' in gauge.render()
+
+    def test_tracker_errors_are_counted(self):
+        def fetch(from_date):
+            raise ConnectionError('API недоступен')
+
+        before = metrics.ERRORS.values.get(
+            (('type', 'ConnectionError'),), 0
+        )
+        homework.Tracker(fetch, lambda message: None).poll()
+        assert metrics.ERRORS.values[(('type', 'ConnectionError'),)] == (
+            before + 1
+        ), 'Ошибки цикла опроса должны учитываться по типу исключения.'
+
+    def test_queued_send_errors_are_counted(self):
+        class Bot:
+            def send_message(self, chat_id, text, timeout=None):
+                raise botapi.Unauthorized('бот заблокирован')
+
+        def count(metric, **labels):
+            return metric.values.get(tuple(sorted(labels.items())), 0)
+
+        errors = count(metrics.ERRORS, type='Unauthorized')
+        failures = count(metrics.SEND_FAILURES)
+        outgoing = SendQueue(
+            partial(homework.send_to_chat, Bot()), workers=1
+        ).start()
+        outgoing.submit(1, 'текст')
+        outgoing.drain(timeout=1)
+        assert count(metrics.ERRORS, type='Unauthorized') == errors + 1, (
+            'Ошибки Telegram при отправке из очереди должны учитываться '
+            'в метриках.'
+        )
+        assert count(metrics.SEND_FAILURES) == failures + 1
+
+    def test_endpoint(self):
+        server = metrics.start_server(port=0)
+        try:
+            port = server.server_address[1]
+            response = requests.get(f'http://127.0.0.1:{port}/metrics')
+            assert response.status_code == 200
+            assert 'homework_api_request_seconds' in response.text
+            assert requests.get(
+                f'http://127.0.0.1:{port}/other'
+            ).status_code == 404
+        finally:
+            server.shutdown()
+            server.server_close()
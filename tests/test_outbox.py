@@ -0,0 +1,117 @@
+from functools import partial
+
+import pytest
+from telegram.error import TelegramError
+
+import homework
+from outbox import Outbox, OutboxError
+from sender import SendQueueFull
+
+
+class FlakyTelegram:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.sent = []
+
+    def __call__(self, chat_id, text):
+        if self.failures:
+            self.failures -= 1
+            raise TelegramError('Telegram недоступен')
+        self.sent.append((chat_id, text))
+
+
+class TestOutbox:
+
+    def test_delivered_message_is_not_retried(self, tmp_path, clock):
+        telegram = FlakyTelegram()
+        journal = Outbox(tmp_path / 'outbox.db', telegram, clock=clock)
+        journal.submit('chat', 'text')
+        assert telegram.sent == [('chat', 'text')]
+        assert journal.pending() == 0
+        clock.now += 10 ** 6
+        journal.retry()
+        assert telegram.sent == [('chat', 'text')], (
+            'Доставленное сообщение не должно отправляться повторно.'
+        )
+
+    def test_failed_message_is_retried_with_backoff(self, tmp_path, clock):
+        telegram = FlakyTelegram(failures=2)
+        journal = Outbox(tmp_path / 'outbox.db', telegram,
+                         retry_period=60, clock=clock)
+        journal.submit('chat', 'text')
+        assert journal.pending() == 1
+        clock.now += 59
+        journal.retry()
+        assert not telegram.sent
+        clock.now += 1
+        journal.retry()
+        assert journal.pending() == 1, 'Вторая попытка тоже неудачна.'
+        clock.now += 119
+        journal.retry()
+        assert not telegram.sent, (
+            'Пауза между попытками должна расти.'
+        )
+        clock.now += 1
+        journal.retry()
+        assert telegram.sent == [('chat', 'text')]
+        assert journal.pending() == 0
+
+    def test_messages_survive_restart(self, tmp_path, clock):
+        path = tmp_path / 'outbox.db'
+        journal = Outbox(path, FlakyTelegram(failures=1), clock=clock)
+        journal.submit('chat', 'text')
+        journal.close()
+        telegram = FlakyTelegram()
+        clock.now += 3600
+        Outbox(path, telegram, clock=clock).retry()
+        assert telegram.sent == [('chat', 'text')], (
+            'Недоставленные сообщения должны переживать перезапуск.'
+        )
+
+    def test_write_failure_is_send_failure(self, tmp_path, clock,
+                                           current_timestamp):
+        journal = Outbox(tmp_path / 'outbox.db', FlakyTelegram(), clock=clock)
+        journal.close()
+        with pytest.raises(OutboxError):
+            journal.submit('chat', 'text')
+
+        def fetch(from_date):
+            return {'homeworks': [{'id': 1, 'homework_name': 'hw',
+                                   'status': 'approved'}],
+                    'current_date': current_timestamp}
+
+        tracker = homework.Tracker(fetch, partial(journal.submit, 'chat'))
+        tracker.poll()
+        assert tracker.index.status('1') is None, (
+            'Не записанное в журнал сообщение нужно повторить в следующем '
+            'цикле.'
+        )
+
+    def test_dispatch_failure_is_not_resent(self, tmp_path, clock,
+                                            current_timestamp):
+        telegram = FlakyTelegram()
+        journal = Outbox(tmp_path / 'outbox.db', telegram, clock=clock)
+        failures = [SendQueueFull('очередь заполнена')]
+
+        def dispatch(chat_id, text, message_id):
+            if failures:
+                raise failures.pop()
+            journal.deliver(chat_id, text, message_id)
+
+        journal.dispatch = dispatch
+
+        def fetch(from_date):
+            return {'homeworks': [{'id': 1, 'homework_name': 'hw',
+                                   'status': 'approved'}],
+                    'current_date': current_timestamp}
+
+        tracker = homework.Tracker(fetch, partial(journal.submit, 'chat'))
+        tracker.poll()
+        tracker.poll()
+        clock.now += 3600
+        journal.retry()
+        assert len(telegram.sent) == 1, (
+            'Записанное в журнал сообщение не должно дублироваться, если '
+            'очередь отправки его не приняла.'
+        )
+        assert journal.pending() == 0
@@ -0,0 +1,75 @@
+import pytest
+from telegram.error import RetryAfter, TelegramError
+
+import botapi
+import deadline
+from ratelimit import RateLimiter, TokenBucket
+
+
+class RecordingBot:
+    def __init__(self, failures=()):
+        self.failures = list(failures)
+        self.sent = []
+
+    def send_message(self, chat_id, text, timeout=None):
+        self.timeout = timeout
+        if self.failures:
+            raise self.failures.pop(0)
+        self.sent.append((chat_id, text))
+
+
+@pytest.fixture
+def limiter(clock):
+    return RateLimiter(global_rate=2, global_burst=2, chat_rate=1,
+                       chat_burst=1, retry_limit=2, clock=clock,
+                       sleep=clock.sleep)
+
+
+class TestRateLimit:
+
+    def test_bucket_queues_instead_of_dropping(self, clock):
+        bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+        assert [bucket.reserve() for _ in range(4)] == [0, 0, 0.5, 1.0]
+        clock.sleep(1.0)
+        assert bucket.reserve() == 0.5
+
+    def test_per_chat_limit(self, limiter, clock):
+        bot = RecordingBot()
+        for _ in range(3):
+            limiter.send(bot, 'chat', 'text')
+        assert len(bot.sent) == 3
+        assert clock.now == pytest.approx(2.0), (
+            'Сообщения в один чат должны отправляться не чаще лимита.'
+        )
+
+    def test_global_limit(self, limiter, clock):
+        bot = RecordingBot()
+        for chat_id in range(4):
+            limiter.send(bot, chat_id, 'text')
+        assert clock.now == pytest.approx(1.0), (
+            'Общее число сообщений должно ограничиваться общим лимитом.'
+        )
+
+    def test_retry_after_is_honoured(self, limiter, clock):
+        bot = RecordingBot(failures=[RetryAfter(5)])
+        limiter.send(bot, 'chat', 'text')
+        assert bot.sent == [('chat', 'text')]
+        assert clock.now >= 5, (
+            'Убедитесь, что после `RetryAfter` отправка откладывается.'
+        )
+
+    def test_other_errors_are_raised(self, limiter):
+        with pytest.raises(TelegramError):
+            limiter.send(RecordingBot([TelegramError('boom')]), 'c', 'text')
+        with pytest.raises(RetryAfter):
+            limiter.send(RecordingBot([RetryAfter(1)] * 3), 'c', 'text')
+
+    def test_wait_limited_by_budget(self, limiter, clock):
+        bot = RecordingBot(failures=[RetryAfter(120)])
+        with deadline.cycle(budget=5, clock=clock):
+            with pytest.raises(botapi.TimedOut):
+                limiter.send(bot, 'chat', 'text')
+        assert clock.now < 5, (
+            'Ожидание лимита не должно выходить за бюджет цикла.'
+        )
+        assert not bot.sent
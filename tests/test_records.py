@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+import homework
+from records import Homework, parse_homeworks, Status
+from status_index import StatusIndex
+
+
+ITEM = {
+    'id': 7, 'homework_name': 'hw.zip', 'status': 'approved',
+    'date_updated': '2024-03-01T10:00:00Z', 'lesson_name': 'Проект',
+    'reviewer_comment': 'Отлично'
+}
+
+
+class TestHomework:
+
+    def test_from_dict(self):
+        record = Homework.from_dict(dict(ITEM))
+        assert record.status is Status.APPROVED, (
+            'Статус должен храниться общим объектом Status.'
+        )
+        assert record.get('id', 'hw.zip') == 7
+        assert record.get('lesson_name') is None
+        assert not hasattr(record, '__dict__'), (
+            'Запись должна использовать __slots__.'
+        )
+        assert homework.parse_status(record) == homework.parse_status(ITEM)
+
+    @pytest.mark.parametrize('key', ('homework_name', 'status'))
+    def test_missing_key(self, key):
+        item = dict(ITEM)
+        del item[key]
+        with pytest.raises(KeyError):
+            parse_homeworks([item])
+
+    def test_unknown_status(self):
+        record = Homework.from_dict(dict(ITEM, status='unknown'))
+        assert record.status == 'unknown'
+        with pytest.raises(ValueError):
+            homework.parse_status(record)
+
+    def test_index_interns_statuses(self):
+        state = json.loads(json.dumps({'7': ['approved', None]}))
+        index = StatusIndex(state)
+        assert index.entries['7'][0] is Status.APPROVED
+        assert json.loads(json.dumps(index.to_dict())) == state, (
+            'Индекс со статусами Status должен сохраняться в JSON.'
+        )
+        assert index.changes(parse_homeworks([ITEM])) == [], (
+            'Запись с тем же статусом не должна считаться изменением.'
+        )
@@ -0,0 +1,66 @@
+import pytest
+
+from fake_api import FakeServer
+import homework
+from replay import Replay
+import traffic
+
+
+@pytest.fixture
+def journal(monkeypatch, tmp_path, current_timestamp):
+    path = str(tmp_path / 'traffic.jsonl.gz')
+    with FakeServer(homeworks=3, seed=1) as server:
+        monkeypatch.setattr(homework, 'ENDPOINT', server.endpoint)
+        traffic.start(path)
+        try:
+            homework.get_api_answer(current_timestamp)
+            server.faults.error_rate = 1
+            with pytest.raises(RuntimeError):
+                homework.get_api_answer(current_timestamp)
+            server.faults.error_rate = 0
+            homework.get_api_answer(current_timestamp)
+        finally:
+            traffic.stop()
+    return path
+
+
+class TestTraffic:
+
+    def test_recording(self, journal, current_timestamp):
+        entries = list(traffic.read(journal))
+        assert [entry['status'] for entry in entries] == [200, 500, 200]
+        assert all(
+            entry['from_date'] == current_timestamp for entry in entries
+        )
+        assert entries[0]['elapsed'] >= 0
+        assert len({entry['tenant'] for entry in entries}) == 1
+        with traffic.open_journal(journal, 'r') as file:
+            assert homework.PRACTICUM_TOKEN not in file.read(), (
+                'Журнал не должен содержать токен Практикум.Домашки.'
+            )
+
+    def test_replay(self, journal):
+        messages = []
+        stats = Replay(
+            lambda tenant, message: messages.append(message)
+        ).run(traffic.read(journal))
+        assert stats['entries'] == 3
+        assert stats['errors'] == 1
+        assert stats['tenants'] == 1
+        assert len(messages) == 5, (
+            'Воспроизведение должно отправить три статуса, сообщение '
+            'об ошибке и сообщение о восстановлении.'
+        )
+
+    def test_speed(self):
+        pauses = []
+        entries = [
+            {'time': 100.0, 'tenant': 'a', 'status': 200,
+             'body': '{"homeworks": [], "current_date": 1}'},
+            {'time': 110.0, 'tenant': 'a', 'status': 200,
+             'body': '{"homeworks": [], "current_date": 2}'},
+        ]
+        Replay(lambda *args: None, speed=10, sleep=pauses.append).run(entries)
+        assert pauses == [1.0], (
+            'Паузы между ответами должны сокращаться в speed раз.'
+        )
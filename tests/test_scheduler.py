@@ -0,0 +1,46 @@
+import pytest
+
+from scheduler import Scheduler
+
+
+@pytest.fixture
+def scheduler():
+    return Scheduler(idle=600, active=120, minimum=60, maximum=3600)
+
+
+class TestScheduler:
+
+    def test_idle_period(self, scheduler):
+        scheduler.observe([])
+        assert scheduler.next_delay() == 600
+
+    def test_active_period_while_reviewing(self, scheduler):
+        scheduler.observe([{'homework_name': 'hw', 'status': 'reviewing'}])
+        assert scheduler.next_delay() == 120, (
+            'Пока работа на проверке, опрос должен быть чаще.'
+        )
+        scheduler.observe([{'homework_name': 'hw', 'status': 'approved'}])
+        assert scheduler.next_delay() == 600, (
+            'После проверки работы опрос должен вернуться к обычному периоду.'
+        )
+
+    def test_backoff_after_failures(self, scheduler):
+        delays = []
+        for _ in range(5):
+            scheduler.failure()
+            delays.append(scheduler.next_delay())
+        assert 600 <= delays[0] <= 1200
+        assert 1200 <= delays[1] <= 2400
+        assert all(1800 <= delay <= 3600 for delay in delays[2:]), (
+            'Пауза после ошибок не должна превышать максимальную.'
+        )
+        scheduler.success()
+        assert scheduler.next_delay() == 600
+
+    def test_bounds(self):
+        scheduler = Scheduler(idle=600, active=10, minimum=60, maximum=300)
+        assert scheduler.next_delay() == 300
+        scheduler.observe([{'id': 1, 'status': 'reviewing'}])
+        assert scheduler.next_delay() == 60
+        with pytest.raises(ValueError):
+            Scheduler(minimum=10, maximum=5)
@@ -0,0 +1,51 @@
+import threading
+
+import pytest
+
+from sender import SendQueue, SendQueueFull
+
+
+class TestSendQueue:
+
+    def test_messages_are_sent_in_background(self):
+        sent = []
+        outgoing = SendQueue(
+            lambda chat_id, text: sent.append((chat_id, text)),
+            size=10, workers=2
+        ).start()
+        for number in range(5):
+            outgoing.submit('chat', f'text {number}')
+        assert outgoing.drain(timeout=1) == 0
+        assert sorted(sent) == [('chat', f'text {n}') for n in range(5)], (
+            'Убедитесь, что при остановке очередь отправляет все сообщения.'
+        )
+        assert outgoing.stats()['sent'] == 5
+
+    def test_backpressure(self):
+        release = threading.Event()
+        outgoing = SendQueue(
+            lambda chat_id, text: release.wait(1),
+            size=1, workers=1, timeout=0.05
+        ).start()
+        outgoing.submit('chat', 'first')
+        outgoing.submit('chat', 'second')
+        with pytest.raises(SendQueueFull):
+            for _ in range(2):
+                outgoing.submit('chat', 'third')
+        assert outgoing.stats()['peak_depth'] == 1
+        release.set()
+        outgoing.drain(timeout=1)
+        with pytest.raises(SendQueueFull):
+            outgoing.submit('chat', 'after drain')
+
+    def test_failures_do_not_stop_worker(self):
+        def send(chat_id, text):
+            if text == 'bad':
+                raise RuntimeError('boom')
+
+        outgoing = SendQueue(send, size=10, workers=1).start()
+        outgoing.submit('chat', 'bad')
+        outgoing.submit('chat', 'good')
+        outgoing.drain(timeout=1)
+        assert outgoing.stats()['failed'] == 1
+        assert outgoing.stats()['sent'] == 1
@@ -0,0 +1,55 @@
+import pytest
+import requests
+
+import homework
+import sessions
+
+
+@pytest.fixture
+def pool():
+    yield sessions.startup(pool_size=2, hosts=1, block=False)
+    sessions.shutdown()
+
+
+class TestSessions:
+
+    def test_client_without_pool(self):
+        assert sessions.client() is requests, (
+            'Без открытого пула запросы должны идти через `requests`.'
+        )
+
+    def test_startup_returns_shared_session(self, pool):
+        assert isinstance(pool, requests.Session)
+        assert sessions.startup() is pool, (
+            'Повторный вызов `startup` должен возвращать ту же сессию.'
+        )
+        assert sessions.client() is pool
+        adapter = pool.get_adapter('https://practicum.yandex.ru')
+        assert adapter._pool_maxsize == 2, (
+            'Проверьте, что размер пула задаётся параметром `pool_size`.'
+        )
+
+    def test_shutdown_restores_requests(self, pool):
+        sessions.shutdown()
+        assert sessions.client() is requests
+        sessions.shutdown()
+
+    def test_get_api_answer_uses_pool(self, pool, monkeypatch,
+                                      current_timestamp):
+        calls = []
+
+        class Response:
+            status_code = 200
+
+            def json(self):
+                return {'homeworks': [], 'current_date': current_timestamp}
+
+        def mock_get(**kwargs):
+            calls.append(kwargs)
+            return Response()
+
+        monkeypatch.setattr(pool, 'get', mock_get)
+        homework.get_api_answer(current_timestamp)
+        assert calls and calls[0]['params'] == {
+            'from_date': current_timestamp
+        }, 'Убедитесь, что при открытом пуле запрос идёт через сессию.'
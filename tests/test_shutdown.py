@@ -0,0 +1,99 @@
+import asyncio
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+import engine
+import shutdown
+
+
+def send_signal(delay, signum=signal.SIGTERM):
+    timer = threading.Timer(delay, os.kill, (os.getpid(), signum))
+    timer.start()
+    return timer
+
+
+class TestShutdown:
+
+    def test_sleep_interrupted(self):
+        previous = signal.getsignal(signal.SIGTERM)
+        started = time.monotonic()
+        with shutdown.Shutdown() as stopper:
+            send_signal(0.05)
+            with stopper.interruptible():
+                time.sleep(5)
+        assert time.monotonic() - started < 1, (
+            'Сигнал должен прерывать паузу между циклами.'
+        )
+        assert stopper.requested.is_set()
+        assert signal.getsignal(signal.SIGTERM) is previous, (
+            'После выхода нужно восстановить прежний обработчик сигнала.'
+        )
+
+    def test_work_finishes_before_stop(self):
+        finished = []
+        with shutdown.Shutdown() as stopper:
+            send_signal(0.02).join()
+            time.sleep(0.05)
+            finished.append(True)
+            with pytest.raises(shutdown.Stop):
+                with stopper.interruptible():
+                    time.sleep(5)
+        assert finished, 'Начатый цикл должен завершиться.'
+
+    def test_deadline(self):
+        started = time.monotonic()
+        with shutdown.Shutdown(timeout=0.1) as stopper:
+            send_signal(0.02)
+            while True:
+                time.sleep(0.01)
+        assert stopper.requested.is_set()
+        assert time.monotonic() - started < 1, (
+            'Затянувшийся цикл должен прерываться по истечении таймаута.'
+        )
+
+
+class TestEngineShutdown:
+
+    def test_signal_stops_run(self):
+        class Tracker:
+            polls = 0
+
+            def poll(self):
+                Tracker.polls += 1
+                return 600
+
+        send_signal(0.1)
+        started = time.monotonic()
+        asyncio.run(engine.run([Tracker(), Tracker()], 2))
+        assert time.monotonic() - started < 1, (
+            'engine.run должен завершаться по SIGTERM.'
+        )
+        assert Tracker.polls == 2
+
+    @pytest.mark.parametrize('timeout, signals', ((0.2, 1), (30, 2)))
+    def test_stuck_poll_is_abandoned(self, timeout, signals):
+        release = threading.Event()
+
+        class Tracker:
+            def poll(self):
+                release.wait(5)
+                return 600
+
+        for number in range(signals):
+            send_signal(0.1 * (number + 1))
+        started = time.monotonic()
+        try:
+            unfinished = asyncio.run(engine.run(
+                [Tracker()], 1, stopping=engine.Stopping(timeout=timeout)
+            ))
+        finally:
+            release.set()
+        assert time.monotonic() - started < 1, (
+            'engine.run должен завершаться за SHUTDOWN_TIMEOUT или по '
+            'повторному сигналу, не дожидаясь зависшего цикла.'
+        )
+        assert unfinished == 1
@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+
+import homework  # noqa: F401 - модули бота уже загружены
+import startup
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestStartup:
+
+    def test_heavy_modules_not_loaded(self):
+        code = (
+            'import sys, homework; '
+            'print(all(type(sys.modules[name]).__name__ == "_LazyModule" '
+            'for name in ("telegram", "requests")))'
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == 'True', (
+            'Импорт homework не должен загружать telegram и requests.'
+        )
+
+    def test_lazy_import_loaded_module(self):
+        assert startup.lazy_import('json') is sys.modules['json']
+
+    def test_parse_importtime(self):
+        output = (
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       120 |        120 |   json.decoder\n'
+            'import time:      1500 |       2000 | json\n'
+        )
+        assert startup.parse_importtime(output) == [
+            ('json.decoder', 0.12, 0.12), ('json', 1.5, 2.0)
+        ]
+
+    def test_report(self):
+        stages = [('check_tokens', 0.001, NameError('PRACTICUM_TOKEN'))]
+        lines = startup.report([('json', 1.5, 2.0)], stages)
+        assert 'json' in lines[1]
+        assert 'check_tokens: PRACTICUM_TOKEN' in lines[-1], (
+            'Ошибка этапа запуска должна попадать в отчёт.'
+        )
+
+    def test_stages_in_fresh_process(self, monkeypatch):
+        monkeypatch.setenv('TELEGRAM_CLIENT', 'native')
+        stages = startup.profile_stages()
+        names = [name for name, _, _ in stages]
+        assert names[0] == 'import homework'
+        assert stages[0][1] > 0.01, (
+            'Импорт homework нужно замерять в новом процессе, где модули '
+            'бота ещё не загружены.'
+        )
+        assert 'botapi.BotClient' in names and 'telegram.Bot' not in names, (
+            'Замер запуска должен создавать клиент, выбранный '
+            'TELEGRAM_CLIENT.'
+        )
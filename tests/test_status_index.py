@@ -0,0 +1,43 @@
+from status_index import StatusIndex
+
+
+class TestStatusIndex:
+
+    def test_only_transitions_are_emitted(self):
+        index = StatusIndex()
+        first = {'id': 1, 'homework_name': 'hw1', 'status': 'reviewing',
+                 'date_updated': '2024-03-01T10:00:00Z'}
+        assert index.changes([first]) == [first]
+        index.update(first)
+        assert index.changes([first]) == [], (
+            'Повторный статус не должен отправляться ещё раз.'
+        )
+        approved = dict(first, status='approved',
+                        date_updated='2024-03-02T10:00:00Z')
+        assert index.changes([approved]) == [approved]
+
+    def test_every_homework_is_processed_in_order(self):
+        index = StatusIndex({'2': ['approved', '2024-03-01T10:00:00Z']})
+        homeworks = [
+            {'id': 3, 'status': 'rejected',
+             'date_updated': '2024-03-03T10:00:00Z'},
+            {'id': 2, 'status': 'approved',
+             'date_updated': '2024-03-01T10:00:00Z'},
+            {'id': 1, 'status': 'reviewing',
+             'date_updated': '2024-03-02T10:00:00Z'},
+        ]
+        assert [hw['id'] for hw in index.changes(homeworks)] == [1, 3], (
+            'Убедитесь, что обрабатываются все изменившиеся работы, '
+            'начиная с самых ранних.'
+        )
+
+    def test_repeated_review_with_same_status(self):
+        index = StatusIndex({'1': ['rejected', '2024-03-01T10:00:00Z']})
+        again = {'id': 1, 'status': 'rejected',
+                 'date_updated': '2024-03-05T10:00:00Z'}
+        assert index.changes([again]) == [again]
+
+    def test_round_trip(self):
+        index = StatusIndex({'hw': 'approved'})
+        assert index.status('hw') == 'approved'
+        assert StatusIndex(index.to_dict()).entries == index.entries
@@ -0,0 +1,84 @@
+import pytest
+
+from engine import Subscription
+import homework
+from store import Store
+from utils import Clock
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = Store(str(tmp_path / 'store.db'), clock=Clock())
+    yield history
+    history.close()
+
+
+def make_homework(status, date):
+    return {
+        'id': 1, 'homework_name': 'hw.zip', 'status': status,
+        'date_updated': date
+    }
+
+
+class TestStore:
+
+    def test_batched_writes(self, history):
+        history.add_transition('student', make_homework(
+            'reviewing', '2024-01-01T00:00:00Z'
+        ), None)
+        history.add_delivery('student', '1', 'Работа на проверке')
+        assert history.history('student') == [], (
+            'События должны записываться в базу только при flush().'
+        )
+        history.flush()
+        assert history.history('student') == [
+            ('1', None, 'reviewing', '2024-01-01T00:00:00Z')
+        ]
+        assert history.delivered('student') == [
+            ('1', 'Работа на проверке', 0.0, None)
+        ]
+
+    def test_wal_and_indexes(self, history):
+        mode = history.connection.execute('PRAGMA journal_mode').fetchone()
+        assert mode == ('wal',)
+        plan = history.connection.execute(
+            'EXPLAIN QUERY PLAN SELECT * FROM transitions '
+            'WHERE tenant = ? AND homework = ?', ('student', '1')
+        ).fetchall()
+        assert 'transitions_homework' in str(plan), (
+            'Поиск по подписке и работе должен использовать индекс.'
+        )
+
+    def test_subscriptions(self, history):
+        subscriptions = [
+            Subscription('first', 'token1', '1'),
+            Subscription('second', 'token2', '2')
+        ]
+        history.save_subscriptions(subscriptions)
+        history.save_subscriptions([Subscription('first', 'new', '1')])
+        assert [Subscription(*row) for row in history.subscriptions()] == [
+            Subscription('first', 'new', '1'), subscriptions[1]
+        ]
+
+    def test_tracker_records_history(self, history):
+        responses = [
+            {'homeworks': [make_homework(
+                'reviewing', '2024-01-01T00:00:00Z'
+            )], 'current_date': 1},
+            {'homeworks': [make_homework(
+                'approved', '2024-01-02T00:00:00Z'
+            )], 'current_date': 2},
+        ]
+        sent = []
+        tracker = homework.Tracker(
+            lambda time: responses.pop(0), sent.append,
+            store=history, tenant='student'
+        )
+        tracker.poll()
+        tracker.poll()
+        assert [row[1:3] for row in history.history('student', 1)] == [
+            ('reviewing', 'approved'), (None, 'reviewing')
+        ], 'Каждое изменение статуса должно попадать в историю.'
+        assert [row[1] for row in history.delivered('student')] == (
+            sent[::-1]
+        )
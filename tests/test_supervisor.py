@@ -0,0 +1,92 @@
+import sys
+
+from engine import Subscription
+import sharding
+import supervisor
+from utils import Clock
+
+
+def subscriptions(count):
+    return [
+        Subscription(f'student{number}', 'token', str(number))
+        for number in range(count)
+    ]
+
+
+class TestSharding:
+
+    def test_every_subscription_assigned_once(self):
+        items = subscriptions(1000)
+        shards = [sharding.assigned(items, shard, 4) for shard in range(4)]
+        assert sorted(item for shard in shards for item in shard) == sorted(
+            items
+        ), 'Каждая подписка должна обслуживаться ровно одним процессом.'
+        assert min(len(shard) for shard in shards) > 150, (
+            'Подписки должны распределяться между процессами равномерно.'
+        )
+
+    def test_rebalancing_moves_few(self):
+        keys = [str(number) for number in range(2000)]
+        before = sharding.HashRing(4)
+        after = sharding.HashRing(5)
+        moved = sum(before.shard(key) != after.shard(key) for key in keys)
+        assert moved < len(keys) * 0.3, (
+            'При добавлении процесса должна переезжать малая часть подписок.'
+        )
+
+
+class TestSupervisor:
+
+    def test_worker_env(self):
+        env = supervisor.worker_env(2, 4, {'TELEGRAM_TOKEN': 'token'})
+        assert env['ENGINE_SHARD'] == '2'
+        assert env['ENGINE_SHARDS'] == '4'
+        assert env['BOT_COMMANDS'] == 'false'
+        assert float(env['TELEGRAM_GLOBAL_RATE']) == (
+            supervisor.ratelimit.TELEGRAM_GLOBAL_RATE / 4
+        ), 'Общий лимит Telegram должен делиться между процессами.'
+
+    def test_crashed_worker_restarted(self):
+        clock = Clock()
+        manager = supervisor.Supervisor(
+            1, (sys.executable, '-c', 'raise SystemExit(3)'), clock
+        )
+        worker = manager.workers[0]
+        manager.check(worker)
+        worker.process.wait()
+        manager.check(worker)
+        assert worker.process is None
+        assert worker.failures == 1
+        manager.check(worker)
+        assert worker.process is None, (
+            'Перезапуск должен выполняться после паузы.'
+        )
+        clock.now = worker.next_start
+        manager.check(worker)
+        assert worker.process is not None, (
+            'Упавший процесс должен перезапускаться.'
+        )
+        worker.process.wait()
+
+    def test_finished_worker_not_restarted(self):
+        manager = supervisor.Supervisor(
+            1, (sys.executable, '-c', 'pass'), Clock()
+        )
+        worker = manager.workers[0]
+        manager.check(worker)
+        worker.process.wait()
+        manager.check(worker)
+        assert worker.finished
+        assert not manager.alive()
+
+    def test_stop(self):
+        manager = supervisor.Supervisor(
+            2, (sys.executable, '-c', 'import time; time.sleep(30)'), Clock()
+        )
+        for worker in manager.workers:
+            manager.check(worker)
+        manager.stop(timeout=1)
+        assert all(
+            worker.process.returncode is not None
+            for worker in manager.workers
+        ), 'Все процессы должны быть остановлены.'
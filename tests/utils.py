@@ -114,6 +114,19 @@ class MockTelegramBot:
         self.text = text
 
 
+class Clock:
+    """Fake clock: returns `now`, which tests move forward by hand."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
 class BreakInfiniteLoop(Exception):
     pass
 
@@ -0,0 +1,114 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+
+RECORD_FILE = os.getenv('RECORD_FILE')
+
+RECORDING_STARTED = 'Ответы API записываются в {path}'
+RECORD_FAILURE = 'Не удалось записать ответ API в {path}: {error}'
+
+_recorder = None
+_lock = threading.Lock()
+
+
+def open_journal(path, mode):
+    """Файл журнала; при расширении .gz - сжатый gzip."""
+    if str(path).endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def tenant_of(headers):
+    """Обезличенный идентификатор подписки по заголовку авторизации."""
+    token = (headers or {}).get('Authorization', '')
+    return hashlib.sha256(token.encode()).hexdigest()[:12]
+
+
+class Recorder:
+    """Запись ответов API в журнал JSONL, по строке на ответ."""
+
+    def __init__(self, path):
+        """Записи дописываются в конец журнала."""
+        self.path = path
+        self.file = open_journal(path, 'a')
+        self.lock = threading.Lock()
+
+    def write(self, entry):
+        """Запись одного ответа; сбой записи не прерывает опрос."""
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        try:
+            with self.lock:
+                self.file.write(line)
+                self.file.flush()
+        except (OSError, ValueError) as error:
+            logging.warning(RECORD_FAILURE.format(path=self.path, error=error))
+
+    def close(self):
+        """Закрытие журнала."""
+        with self.lock:
+            self.file.close()
+
+
+def start(path=RECORD_FILE):
+    """Включение записи ответов API."""
+    global _recorder
+    with _lock:
+        if _recorder is None:
+            _recorder = Recorder(path)
+            logging.info(RECORDING_STARTED.format(path=path))
+        return _recorder
+
+
+def stop():
+    """Выключение записи."""
+    global _recorder
+    with _lock:
+        if _recorder is not None:
+            _recorder.close()
+            _recorder = None
+
+
+def get(client, url, headers, params, timeout=None):
+    """GET-запрос; при включённой записи ответ попадает в журнал.
+
+    В журнал пишутся время запроса, его длительность, from_date,
+    обезличенная подписка и код с телом ответа либо имя исключения.
+    """
+    recorder = _recorder
+    if recorder is None:
+        return client.get(
+            url=url, headers=headers, params=params, timeout=timeout
+        )
+    entry = {
+        'time': time.time(),
+        'tenant': tenant_of(headers),
+        'from_date': params.get('from_date')
+    }
+    started = time.perf_counter()
+    try:
+        response = client.get(
+            url=url, headers=headers, params=params, timeout=timeout
+        )
+    except Exception as error:
+        entry['elapsed'] = time.perf_counter() - started
+        entry['error'] = type(error).__name__
+        recorder.write(entry)
+        raise
+    entry['elapsed'] = time.perf_counter() - started
+    entry['status'] = response.status_code
+    entry['body'] = response.text
+    recorder.write(entry)
+    return response
+
+
+def read(path):
+    """Записи журнала по порядку."""
+    with open_journal(path, 'r') as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)